@@ -1,22 +1,112 @@
 #!/usr/bin/env python
+import argparse
+import hashlib
 import os
+import socket
 import subprocess
 import sys
+import threading
 import webbrowser
 import time
 import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("app.log"),
-        logging.StreamHandler()
-    ]
-)
+# Logging is configured in main() once the command line is parsed
 logger = logging.getLogger(__name__)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def configure_logging(verbose=False, quiet=False):
+    """
+    Set up console and file logging
+    
+    Args:
+        verbose: Log debug messages
+        quiet: Only log warnings and errors to the console, and skip the log file
+    """
+    handlers = [logging.StreamHandler()]
+    
+    if not quiet:
+        # The log file is opened on the first flush and written in batches
+        file_handler = logging.handlers.RotatingFileHandler(
+            "app.log", maxBytes=1_000_000, backupCount=3, delay=True
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(logging.handlers.MemoryHandler(capacity=100, target=file_handler))
+    
+    level = logging.DEBUG if verbose else logging.WARNING if quiet else logging.INFO
+    logging.basicConfig(level=level, format=LOG_FORMAT, handlers=handlers)
+
+def flush_logs():
+    """
+    Write out any buffered log records
+    """
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments
+    
+    Args:
+        argv: Argument list (defaults to sys.argv)
+        
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Set up and run AI Health Trainer")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("-v", "--verbose", action="store_true", help="log debug messages")
+    group.add_argument("-q", "--quiet", action="store_true", help="log only warnings and skip app.log")
+    return parser.parse_args(argv)
+
+# Project root, model/data files copied into place during setup
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_FILES = [
+    "exercise_model.pkl",
+    "body_type_model.pkl",
+    "feature_names.pkl",
+    "exercise_classifier.pkl"
+]
+# Exports the models are preferably loaded from: ONNX files and packed forest
+# directories written next to the pickles
+MODEL_EXPORTS = [
+    "exercise_model.onnx",
+    "exercise_classifier.onnx",
+    "exercise_model.forest",
+    "exercise_classifier.forest",
+    "body_type_model.forest"
+]
+DATA_FILES = [
+    "body_data.csv",
+    "exercise_data.csv",
+    "predicted_body_types.csv",
+    "test_data.csv"
+]
+
+# Sentinel written after a complete setup, holding the setup version
+SETUP_SENTINEL_PATH = os.path.join(BASE_DIR, "models", ".setup_ok")
+
+# Marker recording the requirements hash of the last successful install
+REQUIREMENTS_HASH_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ai-health-trainer", "req.sha")
+
+def requirements_hash(requirements_path):
+    """
+    Hash the requirements file together with the running interpreter
+    
+    Args:
+        requirements_path: Path to requirements.txt
+        
+    Returns:
+        Hex digest identifying this set of requirements for this interpreter
+    """
+    with open(requirements_path, "rb") as f:
+        digest = hashlib.sha256(f.read())
+    
+    # A different interpreter (e.g. a new virtualenv) needs its own install
+    digest.update(sys.executable.encode("utf-8"))
+    return digest.hexdigest()
 
 def check_dependencies():
     """
@@ -31,10 +121,36 @@ def check_dependencies():
             logger.error("Requirements file not found. Please ensure requirements.txt is present.")
             return False
         
-        # Install dependencies
-        logger.info("Installing dependencies...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", requirements_path])
-        logger.info("Dependencies installed successfully")
+        # Skip pip entirely if these requirements were already installed
+        current_hash = requirements_hash(requirements_path)
+        if os.path.exists(REQUIREMENTS_HASH_PATH):
+            with open(REQUIREMENTS_HASH_PATH, "r") as f:
+                if f.read().strip() == current_hash:
+                    logger.info("Dependencies already installed")
+                    return True
+        
+        # Use a project-local wheel cache and prefer prebuilt wheels
+        env = dict(os.environ)
+        env.setdefault("PIP_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".pip-cache"))
+        pip_cmd = [sys.executable, "-m", "pip", "install",
+                   "--prefer-binary", "--disable-pip-version-check", "--no-input",
+                   "-r", requirements_path]
+        
+        # Quick check: a dry run reports what is missing without installing anything
+        dry_run = subprocess.run(pip_cmd + ["--dry-run"], env=env, capture_output=True, text=True)
+        if dry_run.returncode == 0 and "Would install" not in dry_run.stdout:
+            logger.info("Dependencies already satisfied")
+        else:
+            # Install dependencies
+            logger.info("Installing dependencies...")
+            subprocess.check_call(pip_cmd, env=env)
+            logger.info("Dependencies installed successfully")
+        
+        # Remember the installed requirements for the next launch
+        Path(REQUIREMENTS_HASH_PATH).parent.mkdir(parents=True, exist_ok=True)
+        with open(REQUIREMENTS_HASH_PATH, "w") as f:
+            f.write(current_hash)
+        
         return True
     except subprocess.CalledProcessError as e:
         logger.error(f"Error installing dependencies: {e}")
@@ -62,20 +178,95 @@ def ensure_data_directory():
         logger.error(f"Error creating directories: {e}")
         return False
 
-def copy_model_files():
+def copy_if_changed(source_path, target_path):
     """
-    Copy model files to the correct directory
+    Copy a file or directory unless the target is already an up-to-date copy
+    
+    Args:
+        source_path: File or directory to copy
+        target_path: Destination path
+        
+    Returns:
+        True if anything was copied or removed, False if it was already up to date
     """
+    import shutil
+    
+    if os.path.isdir(source_path):
+        # Mirror the directory file by file, dropping files the source no longer has
+        if os.path.isfile(target_path):
+            os.remove(target_path)
+        Path(target_path).mkdir(parents=True, exist_ok=True)
+        names = os.listdir(source_path)
+        changed = False
+        for name in os.listdir(target_path):
+            if name not in names:
+                remove_path(os.path.join(target_path, name))
+                changed = True
+        for name in names:
+            changed |= copy_if_changed(os.path.join(source_path, name), os.path.join(target_path, name))
+        return changed
+    
+    # Same size and not older than the source means nothing changed
+    if os.path.exists(target_path):
+        source_stat = os.stat(source_path)
+        target_stat = os.stat(target_path)
+        if (target_stat.st_size == source_stat.st_size and
+                target_stat.st_mtime >= source_stat.st_mtime):
+            return False
+        remove_path(target_path)
+    
+    # Hard link when possible to avoid copying bytes, otherwise copy
     try:
-        import shutil
+        os.link(source_path, target_path)
+    except OSError:
+        shutil.copy2(source_path, target_path)
+    return True
+
+def remove_path(path):
+    """
+    Remove a file or directory tree
+    
+    Args:
+        path: Path to remove
+    """
+    import shutil
+    
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+def copy_files(source_dir, target_dir, files, max_workers=4):
+    """
+    Copy the files and directories that exist in source_dir to target_dir in parallel
+    
+    Args:
+        source_dir: Directory containing the source files
+        target_dir: Destination directory
+        files: File or directory names to copy
+        max_workers: Number of copy threads
         
-        # Define source paths (original model files)
-        source_files = [
-            "exercise_model.pkl",
-            "body_type_model.pkl",
-            "feature_names.pkl",
-            "exercise_classifier.pkl"
-        ]
+    Returns:
+        List of file names that were actually copied
+    """
+    def copy_one(file):
+        source_path = os.path.join(source_dir, file)
+        if not os.path.exists(source_path):
+            return False
+        return copy_if_changed(source_path, os.path.join(target_dir, file))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        copied = list(executor.map(copy_one, files))
+    
+    return [file for file, was_copied in zip(files, copied) if was_copied]
+
+def copy_model_files():
+    """
+    Copy model files and their exports to the correct directory
+    """
+    try:
+        # Define source paths (original model files and exports)
+        source_files = MODEL_FILES + MODEL_EXPORTS
         
         # Define target directory
         target_dir = os.path.join(os.path.dirname(__file__), "models")
@@ -84,12 +275,16 @@ def copy_model_files():
         source_dir = os.path.join(os.path.dirname(__file__), "models_data")
         
         # Copy files that exist to the models directory
-        for file in source_files:
-            source_path = os.path.join(source_dir, file)
-            if os.path.exists(source_path):
-                target_path = os.path.join(target_dir, file)
-                shutil.copy2(source_path, target_path)
-                logger.info(f"Copied {file} from models_data to models directory")
+        for file in copy_files(source_dir, target_dir, source_files):
+            logger.info(f"Copied {file} from models_data to models directory")
+        
+        # Drop copied exports whose source was removed, e.g. by retraining a
+        # model that cannot be exported
+        for file in MODEL_EXPORTS:
+            target_path = os.path.join(target_dir, file)
+            if os.path.exists(target_path) and not os.path.exists(os.path.join(source_dir, file)):
+                remove_path(target_path)
+                logger.info(f"Removed {file} from models directory")
         
         return True
     except Exception as e:
@@ -101,32 +296,120 @@ def copy_data_files():
     Copy data files to the correct directory
     """
     try:
-        import shutil
-        
         # Define source paths (original data files)
-        source_files = [
-            "body_data.csv",
-            "exercise_data.csv",
-            "predicted_body_types.csv",
-            "test_data.csv"
-        ]
+        source_files = DATA_FILES
         
         # Define target directory
         target_dir = os.path.join(os.path.dirname(__file__), "data")
         
         # Copy files that exist to the data directory
-        for file in source_files:
-            source_path = os.path.join(os.path.dirname(__file__), file)
-            if os.path.exists(source_path):
-                target_path = os.path.join(target_dir, file)
-                shutil.copy2(source_path, target_path)
-                logger.info(f"Copied {file} to data directory")
+        for file in copy_files(os.path.dirname(__file__), target_dir, source_files):
+            logger.info(f"Copied {file} to data directory")
         
         return True
     except Exception as e:
         logger.error(f"Error copying data files: {e}")
         return False
 
+def setup_version():
+    """
+    Compute a version stamp for the current setup inputs
+    
+    Returns:
+        Hex digest of requirements.txt, the interpreter and the source
+        model/export/data file mtimes
+    """
+    digest = hashlib.sha256(sys.executable.encode("utf-8"))
+    
+    requirements_path = os.path.join(BASE_DIR, "requirements.txt")
+    if os.path.exists(requirements_path):
+        with open(requirements_path, "rb") as f:
+            digest.update(f.read())
+    
+    # Any added, removed or modified source file changes the stamp
+    source_paths = [os.path.join(BASE_DIR, "models_data", file) for file in MODEL_FILES + MODEL_EXPORTS]
+    source_paths += [os.path.join(BASE_DIR, file) for file in DATA_FILES]
+    for path in source_paths:
+        if os.path.isdir(path):
+            # Export directories: include every file in them
+            for entry in sorted(os.scandir(path), key=lambda entry: entry.name):
+                digest.update(f"{entry.path}:{entry.stat().st_mtime_ns}".encode("utf-8"))
+            continue
+        mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+        digest.update(f"{path}:{mtime}".encode("utf-8"))
+    
+    return digest.hexdigest()
+
+def is_setup_current(version):
+    """
+    Check whether the setup sentinel matches the given version
+    
+    Args:
+        version: Version stamp from setup_version()
+        
+    Returns:
+        True if a previous setup with the same inputs completed
+    """
+    try:
+        with open(SETUP_SENTINEL_PATH, "r") as f:
+            return f.read().strip() == version
+    except OSError:
+        return False
+
+def write_setup_sentinel(version):
+    """
+    Record a successful setup
+    
+    Args:
+        version: Version stamp from setup_version()
+    """
+    try:
+        with open(SETUP_SENTINEL_PATH, "w") as f:
+            f.write(version)
+    except OSError as e:
+        logger.error(f"Error writing setup sentinel: {e}")
+
+def open_browser_when_ready(host, port, timeout=30.0):
+    """
+    Wait for the Streamlit server to accept connections, then open the browser
+    
+    Args:
+        host: Server host
+        port: Server port
+        timeout: Maximum number of seconds to wait
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.1):
+                break
+        except OSError:
+            time.sleep(0.1)
+    else:
+        logger.error(f"App did not start listening on port {port} within {timeout:.0f}s")
+        return
+    
+    webbrowser.open_new(f"http://{host}:{port}")
+
+def find_free_port(preferred=8501):
+    """
+    Find a free local port for the Streamlit server
+    
+    Args:
+        preferred: Port to use if it is available
+        
+    Returns:
+        The preferred port if free, otherwise a free port chosen by the OS
+    """
+    for port in (preferred, 0):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind(("localhost", port))
+            except OSError:
+                continue
+            return sock.getsockname()[1]
+    return preferred
+
 def run_app():
     """
     Run the Streamlit app
@@ -143,14 +426,27 @@ def run_app():
         # Run the app
         logger.info("Starting the app...")
         
-        # Construct the command to run the app
-        cmd = [sys.executable, "-m", "streamlit", "run", app_path, "--server.port=8501"]
+        # Construct the command to run the app on a free port
+        port = find_free_port()
+        cmd = [sys.executable, "-m", "streamlit", "run", app_path, f"--server.port={port}"]
         
-        # Open browser
-        webbrowser.open_new("http://localhost:8501")
+        # Persist setup logs before handing over to the server
+        flush_logs()
         
-        # Run the app
-        subprocess.run(cmd)
+        # Start the server, and open the browser once it is listening
+        process = subprocess.Popen(cmd)
+        threading.Thread(
+            target=open_browser_when_ready,
+            args=("localhost", port),
+            daemon=True
+        ).start()
+        
+        # Run the app until the server exits
+        try:
+            process.wait()
+        except KeyboardInterrupt:
+            process.terminate()
+            process.wait()
         return True
     except Exception as e:
         logger.error(f"Error running app: {e}")
@@ -160,6 +456,16 @@ def main():
     """
     Main function
     """
+    args = parse_args()
+    configure_logging(verbose=args.verbose, quiet=args.quiet)
+    
+    # Warm launch: nothing changed since the last complete setup
+    version = setup_version()
+    if is_setup_current(version):
+        logger.info("Setup is up to date, starting the app")
+        run_app()
+        return
+    
     logger.info("Starting AI Health Trainer setup...")
     
     # Check dependencies
@@ -173,10 +479,14 @@ def main():
         return
     
     # Copy model files
-    copy_model_files()
+    models_copied = copy_model_files()
     
     # Copy data files
-    copy_data_files()
+    data_copied = copy_data_files()
+    
+    # Mark the setup complete so the next launch can skip it
+    if models_copied and data_copied:
+        write_setup_sentinel(version)
     
     # Run the app
     run_app()
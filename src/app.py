@@ -8,7 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import utility functions
 from src.utils.config_utils import get_app_config, get_mediapipe_config
-from src.utils.ui_utils import set_page_config, apply_custom_css, display_header, create_card
+from src.utils.ui_utils import set_page_config, apply_custom_css, display_header, display_navigation, create_card
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -40,23 +40,7 @@ def main():
         )
         
         # Sidebar navigation
-        st.sidebar.title("Navigation")
-        
-        # Page navigation buttons with icons
-        if st.sidebar.button("🏋️ Exercise Verification"):
-            st.switch_page("pages/exercise_verification.py")
-            
-        if st.sidebar.button("📏 Body Analysis"):
-            st.switch_page("pages/body_analysis.py")
-            
-        if st.sidebar.button("📋 Exercise Recommendations"):
-            st.switch_page("pages/exercise_recommendations.py")
-            
-        if st.sidebar.button("📈 Progress Tracking"):
-            st.switch_page("pages/progress_tracking.py")
-        
-        if st.sidebar.button("🧮 Health Measurements"):
-            st.switch_page("pages/measurements.py")
+        display_navigation("app.py")
         
         # Main content - use columns for a better layout
         col1, col2 = st.columns([2, 1])
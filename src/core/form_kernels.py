@@ -0,0 +1,147 @@
+import math
+
+# Numba is optional: when it is installed the kernels below are compiled to
+# native code, otherwise they run as plain Python functions.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """
+        Fallback for numba.njit that returns the function unchanged
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Fast-math flags without "nnan"/"ninf", so degenerate joints still yield NaN
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+# MediaPipe PoseLandmark indices used by the form kernels. The values are
+# fixed by the Pose model, so they are bound here as plain ints rather than
+# importing mediapipe at module load.
+L_SHO, R_SHO = 11, 12
+L_ELB, R_ELB = 13, 14
+L_WRI, R_WRI = 15, 16
+L_HIP, R_HIP = 23, 24
+L_KNE, R_KNE = 25, 26
+L_ANK, R_ANK = 27, 28
+
+@njit(cache=True, fastmath=_FASTMATH)
+def joint_angle(pts, a, b, c):
+    """
+    Calculate the 2D angle at landmark b formed by landmarks a and c
+
+    Args:
+        pts: Pose landmarks as a float32 (N, 4) array
+        a: Index of the first point
+        b: Index of the vertex
+        c: Index of the third point
+
+    Returns:
+        Angle in degrees, NaN if a segment has zero length
+    """
+    dx1 = pts[a, 0] - pts[b, 0]
+    dy1 = pts[a, 1] - pts[b, 1]
+    dx2 = pts[c, 0] - pts[b, 0]
+    dy2 = pts[c, 1] - pts[b, 1]
+
+    norm = math.sqrt((dx1 * dx1 + dy1 * dy1) * (dx2 * dx2 + dy2 * dy2))
+    if norm == 0.0:
+        return math.nan
+
+    # Clip the cosine against rounding error before acos
+    cos_angle = max(-1.0, min(1.0, (dx1 * dx2 + dy1 * dy2) / norm))
+    return math.degrees(math.acos(cos_angle))
+
+@njit(cache=True, fastmath=_FASTMATH)
+def alignment_cos(pts, a, b, c):
+    """
+    Calculate the absolute cosine between segments b->a and b->c
+
+    Args:
+        pts: Pose landmarks as a float32 (N, 4) array
+        a: Index of the first point
+        b: Index of the middle point
+        c: Index of the third point
+
+    Returns:
+        Absolute cosine in [0, 1] (1 means collinear), 0 if a segment has zero length
+    """
+    dx1 = pts[a, 0] - pts[b, 0]
+    dy1 = pts[a, 1] - pts[b, 1]
+    dx2 = pts[c, 0] - pts[b, 0]
+    dy2 = pts[c, 1] - pts[b, 1]
+
+    norm = math.sqrt((dx1 * dx1 + dy1 * dy1) * (dx2 * dx2 + dy2 * dy2))
+    if norm == 0.0:
+        return 0.0
+
+    return abs(dx1 * dx2 + dy1 * dy2) / norm
+
+@njit(cache=True, fastmath=_FASTMATH)
+def pushup_metrics(pts):
+    """
+    Compute the numeric push-up form metrics
+
+    Args:
+        pts: Pose landmarks as a float32 (N, 4) array
+
+    Returns:
+        Tuple of (smaller elbow angle, left body-line cosine, right body-line cosine)
+    """
+    elbow_angle = min(joint_angle(pts, L_SHO, L_ELB, L_WRI),
+                      joint_angle(pts, R_SHO, R_ELB, R_WRI))
+    return (elbow_angle,
+            alignment_cos(pts, L_SHO, L_HIP, L_ANK),
+            alignment_cos(pts, R_SHO, R_HIP, R_ANK))
+
+@njit(cache=True, fastmath=_FASTMATH)
+def leg_metrics(pts):
+    """
+    Compute the numeric metrics shared by the squat and lunge analyzers
+
+    Args:
+        pts: Pose landmarks as a float32 (N, 4) array
+
+    Returns:
+        Tuple of (smaller knee angle, left/right shoulder-minus-hip x offset,
+        left/right knee-minus-ankle x offset)
+    """
+    knee_angle = min(joint_angle(pts, L_HIP, L_KNE, L_ANK),
+                     joint_angle(pts, R_HIP, R_KNE, R_ANK))
+    return (knee_angle,
+            pts[L_SHO, 0] - pts[L_HIP, 0],
+            pts[R_SHO, 0] - pts[R_HIP, 0],
+            pts[L_KNE, 0] - pts[L_ANK, 0],
+            pts[R_KNE, 0] - pts[R_ANK, 0])
+
+@njit(cache=True, fastmath=_FASTMATH)
+def plank_metrics(pts):
+    """
+    Compute the numeric plank form metrics
+
+    Args:
+        pts: Pose landmarks as a float32 (N, 4) array
+
+    Returns:
+        Tuple of (left/right body-line cosine, left/right hip-minus-shoulder y offset)
+    """
+    return (alignment_cos(pts, L_SHO, L_HIP, L_ANK),
+            alignment_cos(pts, R_SHO, R_HIP, R_ANK),
+            pts[L_HIP, 1] - pts[L_SHO, 1],
+            pts[R_HIP, 1] - pts[R_SHO, 1])
+
+def warm_up() -> None:
+    """
+    Compile the form kernels for the float32 landmark arrays used at runtime
+
+    With Numba installed, the first call of each kernel compiles it (or
+    loads it from the on-disk cache); calling this ahead of time keeps that
+    delay off the first analyzed frame. Without Numba it is a no-op in effect.
+    """
+    import numpy as np
+
+    pts = np.zeros((33, 4), dtype=np.float32)
+    pushup_metrics(pts)
+    leg_metrics(pts)
+    plank_metrics(pts)
@@ -0,0 +1,247 @@
+import threading
+import logging
+import sys
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from src.core import form_kernels
+from src.core.pose_estimation import PoseEstimator
+from src.utils.mjpeg_server import open_stream, close_stream, stream_url
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Webcam frames are requested at this size and downscaled so their longest
+# side is at most VERIFICATION_MAX_DIM pixels before pose estimation; pose
+# cost scales with pixel count, and the browser scales the preview back up
+CAPTURE_SIZE = (640, 480)
+VERIFICATION_MAX_DIM = 480
+
+# JPEG quality of the live preview frames
+PREVIEW_JPEG_QUALITY = 75
+
+# After NO_POSE_SKIP_AFTER consecutive frames without a pose (user off camera),
+# pose estimation only runs on every NO_POSE_DETECT_EVERY-th frame until a
+# pose is found again; the frames in between are published as they are
+NO_POSE_SKIP_AFTER = 5
+NO_POSE_DETECT_EVERY = 3
+
+# Frames queued by the camera driver while the previous frame was processed
+# come back from grab() almost instantly, a fresh frame only after a frame
+# interval; grabs faster than this are dropped as stale, at most
+# MAX_STALE_FRAMES in a row
+STALE_GRAB_SECONDS = 0.005
+MAX_STALE_FRAMES = 5
+
+# The page sends a heartbeat on every feedback refresh; a session without one
+# for this many seconds belongs to a closed tab, so its worker stops and
+# another session may take the webcam
+HEARTBEAT_TIMEOUT = 30.0
+
+def open_webcam(camera_index: int = 0) -> Any:
+    """
+    Open a webcam and request frames at CAPTURE_SIZE
+    
+    Opening a camera takes up to a couple of seconds while the driver is
+    negotiated, so the capture is meant to be kept open and reused.
+    
+    Args:
+        camera_index: OpenCV index of the webcam
+        
+    Returns:
+        cv2.VideoCapture, which is not opened if the webcam is unavailable
+    """
+    import cv2
+    
+    # DirectShow opens much faster than the default Media Foundation backend
+    cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW if sys.platform == "win32" else cv2.CAP_ANY)
+    if cap.isOpened():
+        # Avoid the camera producing larger frames than needed
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_SIZE[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_SIZE[1])
+        
+        # Keep a single frame queued, where the backend supports it
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+class LiveVerification:
+    """
+    Webcam exercise verification running in a background thread
+    
+    Each frame is analyzed for form and published as JPEG to an MJPEG
+    stream, so the video never goes through Streamlit reruns.
+    """
+    def __init__(self, pose_estimator: PoseEstimator, exercise_type: str, cap: Any):
+        """
+        Initialize the verification session
+        
+        Args:
+            pose_estimator: Pose estimator for this session
+            exercise_type: Exercise being verified
+            cap: Webcam capture from open_webcam; it is left open when the
+                session stops, and released only if reading from it fails
+        """
+        import cv2
+        
+        self._cv2 = cv2
+        self.pose_estimator = pose_estimator
+        self.exercise_type = exercise_type
+        
+        self.stream_id = uuid.uuid4().hex
+        self.failed = False
+        self.stream_failed = False
+        
+        self._cap = cap
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._last_heartbeat = time.monotonic()
+        
+        # Latest form analysis, replaced (never mutated) by the worker thread
+        self._feedback: Dict[str, Any] = {"correct": False, "feedback": "", "metrics": {}}
+    
+    @property
+    def url(self) -> str:
+        """
+        URL of the annotated video stream
+        """
+        return stream_url(self.stream_id)
+    
+    @property
+    def feedback(self) -> Dict[str, Any]:
+        """
+        Latest form analysis, kept while no pose is detected
+        """
+        return self._feedback
+    
+    @property
+    def running(self) -> bool:
+        """
+        Whether frames are still being processed
+        """
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def stale(self) -> bool:
+        """
+        Whether the page showing this session stopped sending heartbeats
+        """
+        return time.monotonic() - self._last_heartbeat > HEARTBEAT_TIMEOUT
+    
+    def heartbeat(self) -> None:
+        """
+        Record that the page showing this session is still open
+        """
+        self._last_heartbeat = time.monotonic()
+    
+    def start(self) -> bool:
+        """
+        Start processing frames from the webcam
+        
+        Returns:
+            True if the webcam is open and the stream started, False otherwise;
+            stream_failed tells a stream failure apart from a webcam failure
+        """
+        if not self._cap.isOpened():
+            logger.error("Failed to open webcam")
+            return False
+        
+        # Compile the form kernels while the stream starts
+        threading.Thread(target=form_kernels.warm_up, name="form-kernel-warmup", daemon=True).start()
+        
+        try:
+            stream = open_stream(self.stream_id)
+        except OSError as e:
+            # The MJPEG server could not bind its port
+            logger.error(f"Failed to start video stream: {e}")
+            self.stream_failed = True
+            return False
+        
+        self._thread = threading.Thread(target=self._run, args=(stream,), name="live-verification", daemon=True)
+        self._thread.start()
+        return True
+    
+    def stop(self) -> None:
+        """
+        Stop processing frames, leaving the webcam open for the next session
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        close_stream(self.stream_id)
+    
+    def _read_latest(self) -> Any:
+        """
+        Read the most recent webcam frame, dropping frames queued before it
+        
+        Frames queue up in the driver while a slow frame is processed, and
+        while the webcam is kept open between sessions.
+        
+        Returns:
+            Tuple of (success flag, BGR frame or None)
+        """
+        for _ in range(MAX_STALE_FRAMES):
+            start = time.perf_counter()
+            if not self._cap.grab():
+                return False, None
+            if time.perf_counter() - start > STALE_GRAB_SECONDS:
+                # Waited for the camera, so this frame is fresh
+                break
+        return self._cap.retrieve()
+    
+    def _run(self, stream: Any) -> None:
+        """
+        Read, analyze and publish frames until stopped
+        
+        Args:
+            stream: FrameStream to publish the annotated frames to
+        """
+        cv2 = self._cv2
+        miss_count = 0
+        frame_index = 0
+        try:
+            while not self._stop_event.is_set():
+                # Stop reading the webcam once the page is gone
+                if self.stale:
+                    logger.warning("No heartbeat from the verification page, stopping")
+                    break
+                
+                # Read the latest frame from the webcam, skipping queued ones
+                ret, frame = self._read_latest()
+                if not ret:
+                    # Release the webcam so it is reopened next time
+                    logger.error("Failed to read from webcam")
+                    self._cap.release()
+                    self.failed = True
+                    break
+                
+                # Downscale before pose estimation and drawing
+                height, width = frame.shape[:2]
+                scale = VERIFICATION_MAX_DIM / max(height, width)
+                if scale < 1:
+                    frame = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+                
+                frame_index += 1
+                if miss_count > NO_POSE_SKIP_AFTER and frame_index % NO_POSE_DETECT_EVERY != 0:
+                    # Nobody in view; publish the raw frame without pose estimation
+                    annotated_image = frame
+                else:
+                    # Process the frame, drawing on it directly since it is ours
+                    annotated_image, results = self.pose_estimator.process_image(frame, inplace=True)
+                    
+                    # Analyze exercise form
+                    if results and results.pose_landmarks:
+                        miss_count = 0
+                        self._feedback = self.pose_estimator.analyze_exercise_form(results, self.exercise_type)
+                    else:
+                        miss_count += 1
+                
+                # Publish the annotated frame to the video stream
+                ok, jpeg = cv2.imencode(".jpg", annotated_image, [cv2.IMWRITE_JPEG_QUALITY, PREVIEW_JPEG_QUALITY])
+                if ok:
+                    stream.publish(jpeg.tobytes())
+        except Exception as e:
+            logger.error(f"Error in live verification: {e}")
+            self.failed = True
+        finally:
+            close_stream(self.stream_id)
@@ -1,23 +1,58 @@
-import cv2
-import mediapipe as mp
 import numpy as np
-import pandas as pd
+import threading
 import logging
-from typing import Dict, List, Tuple, Optional, Any, Union
+from typing import Dict, List, Tuple, Optional, Any, Union, TYPE_CHECKING
+
+from src.core.form_kernels import (
+    L_SHO, R_SHO, L_WRI, R_WRI, L_HIP, R_HIP, L_ANK, R_ANK,
+    pushup_metrics, leg_metrics, plank_metrics
+)
+from src.models.utils.body_rules import classify_ratios
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Initialize MediaPipe
-mp_pose = mp.solutions.pose
-mp_drawing = mp.solutions.drawing_utils
-mp_drawing_styles = mp.solutions.drawing_styles
+# Feature keys in landmark order, matching the flattened (x, y, z, visibility) layout
+_FEATURE_KEYS = [f"landmark_{i}_{c}" for i in range(33) for c in ("x", "y", "z", "visibility")]
+
+# Scale for int16-quantized landmarks (dequantize by dividing by this)
+LANDMARK_QUANT_SCALE = 10000
+
+# Minimum absolute cosine for three landmarks to count as a straight line
+ALIGNMENT_MIN_COS = 0.9
+
+# Frames larger than this (longest side, in pixels) are downscaled before
+# inference; MediaPipe resizes to its own small input size anyway
+PROCESS_MAX_DIM = 480
+
+# Segment endpoints for body measurements, in the order they are unpacked
+MEASUREMENT_PAIRS = np.array([
+    [L_SHO, R_SHO],
+    [L_HIP, R_HIP],
+    [L_HIP, L_ANK],
+    [R_HIP, R_ANK],
+    [L_SHO, L_WRI],
+    [R_SHO, R_WRI],
+], dtype=np.intp)
 
 class PoseEstimator:
     """
     Class for pose estimation using MediaPipe
     """
+    # Display labels of the form analysis metrics, by metric key
+    METRIC_LABELS = {
+        metric: metric.replace("_", " ").title()
+        for metric in (
+            "elbow_angle", "back_straight",
+            "knee_angle", "knees_over_toes",
+            "body_alignment", "hip_position",
+            "front_knee_angle", "torso_upright", "knee_ankle_alignment"
+        )
+    }
+    
     def __init__(self, 
                  static_image_mode: bool = False, 
                  model_complexity: int = 1, 
@@ -32,43 +67,111 @@ class PoseEstimator:
             min_detection_confidence: Minimum confidence for detection
             min_tracking_confidence: Minimum confidence for tracking
         """
-        self.pose = mp_pose.Pose(
-            static_image_mode=static_image_mode,
-            model_complexity=model_complexity,
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
-        )
+        # Import OpenCV only when an estimator is created
+        import cv2
+        
+        self._cv2 = cv2
+        
+        # RGB frame buffer reused across calls while the frame size is unchanged;
+        # the lock guards it and the Pose graph when an estimator is shared
+        self._rgb_buf = None
+        self._lock = threading.Lock()
+        
+        # Column index for landmarks_to_dataframe, built on first use
+        self._df_columns = None
+        
+        # MediaPipe and the Pose graph are loaded on first use
+        self._mp_solutions = None
+        self._pose = None
+        self._landmark_style = None
+        self._pose_kwargs = {
+            "static_image_mode": static_image_mode,
+            "model_complexity": model_complexity,
+            "min_detection_confidence": min_detection_confidence,
+            "min_tracking_confidence": min_tracking_confidence
+        }
         logger.info("PoseEstimator initialized successfully")
+    
+    @property
+    def _solutions(self) -> Any:
+        """
+        MediaPipe solutions package, imported on first access
+        """
+        if self._mp_solutions is None:
+            import mediapipe as mp
+            self._mp_solutions = mp.solutions
+        return self._mp_solutions
+    
+    @property
+    def pose(self) -> Any:
+        """
+        MediaPipe Pose solution, created on first access
+        """
+        if self._pose is None:
+            self._pose = self._solutions.pose.Pose(**self._pose_kwargs)
+            logger.info("MediaPipe Pose model loaded")
+        return self._pose
+    
+    @property
+    def landmark_drawing_spec(self) -> Any:
+        """
+        Default pose landmark drawing style, built on first access
+        """
+        if self._landmark_style is None:
+            self._landmark_style = self._solutions.drawing_styles.get_default_pose_landmarks_style()
+        return self._landmark_style
         
-    def process_image(self, image: np.ndarray) -> Tuple[np.ndarray, Optional[Any]]:
+    def process_image(self, image: np.ndarray, draw: bool = True, inplace: bool = False) -> Tuple[np.ndarray, Optional[Any]]:
         """
         Process an image and detect pose landmarks
         
         Args:
             image: Input image (BGR format)
+            draw: Whether to draw the detected landmarks on a copy of the image
+            inplace: Draw directly on the input image instead of a copy
             
         Returns:
-            Tuple of (annotated image, pose results)
+            Tuple of (annotated image, pose results). The input image itself is
+            returned when nothing was drawn.
         """
         try:
-            # Convert BGR to RGB
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            # Downscale large frames before conversion and inference
+            height, width = image.shape[:2]
+            scale = PROCESS_MAX_DIM / max(height, width)
+            if scale < 1:
+                small = self._cv2.resize(image, None, fx=scale, fy=scale, interpolation=self._cv2.INTER_AREA)
+            else:
+                small = image
             
-            # Process the image
-            results = self.pose.process(image_rgb)
+            with self._lock:
+                # Convert BGR to RGB into the reusable buffer
+                if self._rgb_buf is None or self._rgb_buf.shape != small.shape:
+                    self._rgb_buf = np.empty_like(small)
+                image_rgb = self._cv2.cvtColor(small, self._cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+                
+                # Process the image; a read-only input lets MediaPipe skip its own copy
+                image_rgb.flags.writeable = False
+                try:
+                    results = self.pose.process(image_rgb)
+                finally:
+                    image_rgb.flags.writeable = True
             
-            # Make a copy of the image for annotation
-            annotated_image = image.copy()
+            # Nothing to draw, so skip the copy
+            if not draw or not results.pose_landmarks:
+                return image, results
+            
+            # Annotate a copy of the full-size image unless the caller opted in
+            annotated_image = image if inplace else image.copy()
+            
+            # Draw pose landmarks on the image (landmarks are normalized,
+            # so they map onto the original resolution unchanged)
+            self._solutions.drawing_utils.draw_landmarks(
+                annotated_image,
+                results.pose_landmarks,
+                self._solutions.pose.POSE_CONNECTIONS,
+                landmark_drawing_spec=self.landmark_drawing_spec
+            )
             
-            # Draw pose landmarks on the image
-            if results.pose_landmarks:
-                mp_drawing.draw_landmarks(
-                    annotated_image,
-                    results.pose_landmarks,
-                    mp_pose.POSE_CONNECTIONS,
-                    landmark_drawing_spec=mp_drawing_styles.get_default_pose_landmarks_style()
-                )
-                
             return annotated_image, results
         except Exception as e:
             logger.error(f"Error processing image: {e}")
@@ -88,19 +191,33 @@ class PoseEstimator:
             logger.warning("No pose landmarks detected")
             return {}
         
-        landmarks = results.pose_landmarks.landmark
-        features = {}
+        # Bulk copy x, y, z, visibility for every landmark into a flat array
+        values = self._to_array(results.pose_landmarks.landmark).ravel()
         
-        # Extract x, y coordinates for each landmark
-        for idx, landmark in enumerate(landmarks):
-            features[f"landmark_{idx}_x"] = landmark.x
-            features[f"landmark_{idx}_y"] = landmark.y
-            features[f"landmark_{idx}_z"] = landmark.z
-            features[f"landmark_{idx}_visibility"] = landmark.visibility
+        return dict(zip(_FEATURE_KEYS, values.tolist()))
+    
+    def extract_landmarks_quantized(self, results: Any) -> np.ndarray:
+        """
+        Extract landmarks as a compact int16 array for storage or transport
+        
+        Args:
+            results: Pose detection results from MediaPipe
             
-        return features
+        Returns:
+            (N, 4) int16 array of x, y, z, visibility scaled by
+            LANDMARK_QUANT_SCALE (empty if no pose was detected)
+        """
+        if not results or not results.pose_landmarks:
+            logger.warning("No pose landmarks detected")
+            return np.empty((0, 4), dtype=np.int16)
+        
+        # Scale, round and saturate to the int16 range
+        scaled = self._to_array(results.pose_landmarks.landmark) * np.float32(LANDMARK_QUANT_SCALE)
+        np.rint(scaled, out=scaled)
+        np.clip(scaled, np.iinfo(np.int16).min, np.iinfo(np.int16).max, out=scaled)
+        return scaled.astype(np.int16)
     
-    def landmarks_to_dataframe(self, features: Dict[str, float]) -> pd.DataFrame:
+    def landmarks_to_dataframe(self, features: Dict[str, float]) -> "pd.DataFrame":
         """
         Convert landmark features to a pandas DataFrame
         
@@ -110,8 +227,34 @@ class PoseEstimator:
         Returns:
             DataFrame of landmark features
         """
+        import pandas as pd
+        
+        # Features from extract_landmarks: build from a row array with the
+        # cached column index instead of letting pandas infer a schema
+        if len(features) == len(_FEATURE_KEYS) and list(features) == _FEATURE_KEYS:
+            if self._df_columns is None:
+                self._df_columns = pd.Index(_FEATURE_KEYS)
+            row = np.fromiter(features.values(), dtype=np.float64, count=len(_FEATURE_KEYS))
+            return pd.DataFrame(row.reshape(1, -1), columns=self._df_columns, copy=False)
+        
         return pd.DataFrame([features])
     
+    def _to_array(self, landmarks: List[Any]) -> np.ndarray:
+        """
+        Convert pose landmarks to a float32 (N, 4) array of x, y, z, visibility
+        
+        Args:
+            landmarks: Pose landmarks
+            
+        Returns:
+            Array with one row per landmark
+        """
+        return np.fromiter(
+            (v for lm in landmarks for v in (lm.x, lm.y, lm.z, lm.visibility)),
+            dtype=np.float32,
+            count=len(landmarks) * 4
+        ).reshape(-1, 4)
+    
     def calculate_body_measurements(self, results: Any) -> Dict[str, float]:
         """
         Calculate body measurements from pose landmarks
@@ -126,38 +269,20 @@ class PoseEstimator:
             logger.warning("No pose landmarks detected for body measurements")
             return {}
         
-        landmarks = results.pose_landmarks.landmark
-        
-        # Extract key landmarks
-        left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-        right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-        left_hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-        right_hip = landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value]
-        left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-        right_ankle = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value]
-        left_wrist = landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value]
-        right_wrist = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value]
-        
-        # Calculate measurements
-        shoulder_width = self._calculate_distance(left_shoulder, right_shoulder)
-        hip_width = self._calculate_distance(left_hip, right_hip)
-        left_leg_length = self._calculate_distance(left_hip, left_ankle)
-        right_leg_length = self._calculate_distance(right_hip, right_ankle)
+        landmarks = self._to_array(results.pose_landmarks.landmark)
+        
+        # Calculate all segment lengths in one pass
+        (shoulder_width, hip_width,
+         left_leg_length, right_leg_length,
+         left_arm_length, right_arm_length) = self._calculate_distances(landmarks, MEASUREMENT_PAIRS).tolist()
         leg_length = (left_leg_length + right_leg_length) / 2
-        left_arm_length = self._calculate_distance(left_shoulder, left_wrist)
-        right_arm_length = self._calculate_distance(right_shoulder, right_wrist)
         arm_length = (left_arm_length + right_arm_length) / 2
         
         # Calculate shoulder-to-hip ratio
         shoulder_hip_ratio = shoulder_width / hip_width if hip_width > 0 else 0
         
         # Determine body type based on ratio
-        if shoulder_hip_ratio > 1.25:
-            body_type = "Inverted Triangle"
-        elif shoulder_hip_ratio < 0.85:
-            body_type = "Pear"
-        else:
-            body_type = "Rectangle"
+        body_type = str(classify_ratios(shoulder_hip_ratio))
             
         return {
             "shoulder_width": shoulder_width,
@@ -168,22 +293,19 @@ class PoseEstimator:
             "body_type": body_type
         }
     
-    def _calculate_distance(self, p1: Any, p2: Any) -> float:
+    def _calculate_distances(self, landmarks: np.ndarray, pairs: np.ndarray) -> np.ndarray:
         """
-        Calculate 3D distance between two points
+        Calculate 3D distances for several pairs of points at once
         
         Args:
-            p1: First point
-            p2: Second point
+            landmarks: Pose landmarks as an (N, 4) array
+            pairs: (M, 2) array of landmark indices
             
         Returns:
-            Euclidean distance between points
+            float32 array of M Euclidean distances
         """
-        return np.sqrt(
-            (p1.x - p2.x) ** 2 +
-            (p1.y - p2.y) ** 2 +
-            (p1.z - p2.z) ** 2
-        )
+        points = np.asarray(landmarks[:, :3], dtype=np.float32)
+        return np.linalg.norm(points[pairs[:, 0]] - points[pairs[:, 1]], axis=1)
     
     def analyze_exercise_form(self, results: Any, exercise_type: str) -> Dict[str, Any]:
         """
@@ -197,10 +319,11 @@ class PoseEstimator:
             Dictionary with exercise form analysis
         """
         if not results or not results.pose_landmarks:
-            logger.warning(f"No pose landmarks detected for {exercise_type} analysis")
+            logger.warning("No pose landmarks detected for %s analysis", exercise_type)
             return {"correct": False, "feedback": "No pose detected. Please ensure your full body is visible."}
         
-        landmarks = results.pose_landmarks.landmark
+        # Convert landmarks once so the analyzers only index into an array
+        landmarks = self._to_array(results.pose_landmarks.landmark)
         
         if exercise_type == "Push-up":
             return self._analyze_pushup_form(landmarks)
@@ -213,36 +336,21 @@ class PoseEstimator:
         else:
             return {"correct": False, "feedback": f"Analysis for {exercise_type} not implemented yet."}
     
-    def _analyze_pushup_form(self, landmarks: List[Any]) -> Dict[str, Any]:
+    def _analyze_pushup_form(self, landmarks: np.ndarray) -> Dict[str, Any]:
         """
         Analyze push-up form
         
         Args:
-            landmarks: Pose landmarks
+            landmarks: Pose landmarks as an (N, 4) array
             
         Returns:
             Dictionary with push-up form analysis
         """
-        # Get key landmarks
-        left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-        right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-        left_elbow = landmarks[mp_pose.PoseLandmark.LEFT_ELBOW.value]
-        right_elbow = landmarks[mp_pose.PoseLandmark.RIGHT_ELBOW.value]
-        left_wrist = landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value]
-        right_wrist = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value]
-        left_hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-        right_hip = landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value]
-        left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-        right_ankle = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value]
-        
-        # Calculate angles
-        left_elbow_angle = self._calculate_angle(left_shoulder, left_elbow, left_wrist)
-        right_elbow_angle = self._calculate_angle(right_shoulder, right_elbow, right_wrist)
-        elbow_angle = min(left_elbow_angle, right_elbow_angle)
-        
-        # Check if back is straight
-        back_straightness = self._check_alignment(left_shoulder, left_hip, left_ankle) and \
-                           self._check_alignment(right_shoulder, right_hip, right_ankle)
+        # Compute the numeric metrics in the compiled kernel
+        elbow_angle, back_cos_left, back_cos_right = (float(v) for v in pushup_metrics(landmarks))
+        
+        # Check if back is straight on both sides
+        back_straightness = back_cos_left > ALIGNMENT_MIN_COS and back_cos_right > ALIGNMENT_MIN_COS
         
         # Determine if form is correct
         correct = elbow_angle < 100 and back_straightness
@@ -266,36 +374,26 @@ class PoseEstimator:
             }
         }
     
-    def _analyze_squat_form(self, landmarks: List[Any]) -> Dict[str, Any]:
+    def _analyze_squat_form(self, landmarks: np.ndarray) -> Dict[str, Any]:
         """
         Analyze squat form
         
         Args:
-            landmarks: Pose landmarks
+            landmarks: Pose landmarks as an (N, 4) array
             
         Returns:
             Dictionary with squat form analysis
         """
-        # Get key landmarks
-        left_hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-        right_hip = landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value]
-        left_knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value]
-        right_knee = landmarks[mp_pose.PoseLandmark.RIGHT_KNEE.value]
-        left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-        right_ankle = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value]
-        left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-        right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-        
-        # Calculate angles
-        left_knee_angle = self._calculate_angle(left_hip, left_knee, left_ankle)
-        right_knee_angle = self._calculate_angle(right_hip, right_knee, right_ankle)
-        knee_angle = min(left_knee_angle, right_knee_angle)
+        # Compute the numeric metrics in the compiled kernel
+        knee_angle, torso_dx_left, torso_dx_right, knee_dx_left, knee_dx_right = (
+            float(v) for v in leg_metrics(landmarks)
+        )
         
         # Check if back is straight (vertical alignment of shoulders and hips)
-        back_straight = abs(left_shoulder.x - left_hip.x) < 0.1 and abs(right_shoulder.x - right_hip.x) < 0.1
+        back_straight = abs(torso_dx_left) < 0.1 and abs(torso_dx_right) < 0.1
         
         # Check knee position (knees should not go too far forward past toes)
-        knees_over_toes = (left_knee.x < left_ankle.x) and (right_knee.x < right_ankle.x)
+        knees_over_toes = knee_dx_left < 0 and knee_dx_right < 0
         
         # Determine if form is correct
         correct = knee_angle < 120 and back_straight and knees_over_toes
@@ -322,30 +420,24 @@ class PoseEstimator:
             }
         }
     
-    def _analyze_plank_form(self, landmarks: List[Any]) -> Dict[str, Any]:
+    def _analyze_plank_form(self, landmarks: np.ndarray) -> Dict[str, Any]:
         """
         Analyze plank form
         
         Args:
-            landmarks: Pose landmarks
+            landmarks: Pose landmarks as an (N, 4) array
             
         Returns:
             Dictionary with plank form analysis
         """
-        # Get key landmarks
-        left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-        right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-        left_hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-        right_hip = landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value]
-        left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-        right_ankle = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value]
+        # Compute the numeric metrics in the compiled kernel
+        body_cos_left, body_cos_right, hip_dy_left, hip_dy_right = (float(v) for v in plank_metrics(landmarks))
         
         # Check if body is in a straight line (shoulders, hips, ankles)
-        body_alignment = self._check_alignment(left_shoulder, left_hip, left_ankle) and \
-                         self._check_alignment(right_shoulder, right_hip, right_ankle)
+        body_alignment = body_cos_left > ALIGNMENT_MIN_COS and body_cos_right > ALIGNMENT_MIN_COS
         
         # Check if hips are not too high or too low
-        hip_position = abs(left_hip.y - left_shoulder.y) < 0.1 and abs(right_hip.y - right_shoulder.y) < 0.1
+        hip_position = abs(hip_dy_left) < 0.1 and abs(hip_dy_right) < 0.1
         
         # Determine if form is correct
         correct = body_alignment and hip_position
@@ -355,7 +447,7 @@ class PoseEstimator:
         if not body_alignment:
             feedback.append("Maintain a straight line from head to heels.")
         if not hip_position:
-            if left_hip.y < left_shoulder.y:
+            if hip_dy_left < 0:
                 feedback.append("Lower your hips, they're too high.")
             else:
                 feedback.append("Raise your hips, they're too low.")
@@ -372,36 +464,26 @@ class PoseEstimator:
             }
         }
     
-    def _analyze_lunge_form(self, landmarks: List[Any]) -> Dict[str, Any]:
+    def _analyze_lunge_form(self, landmarks: np.ndarray) -> Dict[str, Any]:
         """
         Analyze lunge form
         
         Args:
-            landmarks: Pose landmarks
+            landmarks: Pose landmarks as an (N, 4) array
             
         Returns:
             Dictionary with lunge form analysis
         """
-        # Get key landmarks
-        left_hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-        right_hip = landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value]
-        left_knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value]
-        right_knee = landmarks[mp_pose.PoseLandmark.RIGHT_KNEE.value]
-        left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-        right_ankle = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value]
-        left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-        right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-        
-        # Calculate angles
-        left_knee_angle = self._calculate_angle(left_hip, left_knee, left_ankle)
-        right_knee_angle = self._calculate_angle(right_hip, right_knee, right_ankle)
-        front_knee_angle = min(left_knee_angle, right_knee_angle)
+        # Compute the numeric metrics in the compiled kernel
+        front_knee_angle, torso_dx_left, torso_dx_right, knee_dx_left, knee_dx_right = (
+            float(v) for v in leg_metrics(landmarks)
+        )
         
         # Check if torso is upright
-        torso_upright = abs(left_shoulder.x - left_hip.x) < 0.1 and abs(right_shoulder.x - right_hip.x) < 0.1
+        torso_upright = abs(torso_dx_left) < 0.1 and abs(torso_dx_right) < 0.1
         
         # Check if front knee is aligned with ankle
-        knee_ankle_alignment = (abs(left_knee.x - left_ankle.x) < 0.1) or (abs(right_knee.x - right_ankle.x) < 0.1)
+        knee_ankle_alignment = abs(knee_dx_left) < 0.1 or abs(knee_dx_right) < 0.1
         
         # Determine if form is correct
         correct = front_knee_angle < 110 and torso_upright and knee_ankle_alignment
@@ -427,57 +509,3 @@ class PoseEstimator:
                 "knee_ankle_alignment": knee_ankle_alignment
             }
         }
-    
-    def _calculate_angle(self, p1: Any, p2: Any, p3: Any) -> float:
-        """
-        Calculate angle between three points
-        
-        Args:
-            p1: First point
-            p2: Second point (joint/vertex)
-            p3: Third point
-            
-        Returns:
-            Angle in degrees
-        """
-        # Calculate vectors
-        v1 = np.array([p1.x - p2.x, p1.y - p2.y])
-        v2 = np.array([p3.x - p2.x, p3.y - p2.y])
-        
-        # Normalize vectors
-        v1_norm = v1 / np.linalg.norm(v1)
-        v2_norm = v2 / np.linalg.norm(v2)
-        
-        # Calculate dot product
-        dot_product = np.clip(np.dot(v1_norm, v2_norm), -1.0, 1.0)
-        
-        # Calculate angle in degrees
-        angle = np.degrees(np.arccos(dot_product))
-        
-        return angle
-    
-    def _check_alignment(self, p1: Any, p2: Any, p3: Any) -> bool:
-        """
-        Check if three points are approximately aligned
-        
-        Args:
-            p1: First point
-            p2: Second point
-            p3: Third point
-            
-        Returns:
-            True if points are aligned, False otherwise
-        """
-        # Calculate vectors
-        v1 = np.array([p1.x - p2.x, p1.y - p2.y])
-        v2 = np.array([p3.x - p2.x, p3.y - p2.y])
-        
-        # Normalize vectors
-        v1_norm = v1 / np.linalg.norm(v1)
-        v2_norm = v2 / np.linalg.norm(v2)
-        
-        # Calculate dot product
-        dot_product = np.abs(np.dot(v1_norm, v2_norm))
-        
-        # Points are considered aligned if dot product is close to 1
-        return dot_product > 0.9 
\ No newline at end of file
@@ -1 +1,7 @@
-# Model management package 
\ No newline at end of file
+# Model management package
+
+# Use the oneDAL-accelerated scikit-learn estimators when scikit-learn-intelex
+# is installed. This runs before any model module imports from sklearn.
+from .utils.sklearn_patch import patch_sklearn_if_available
+
+patch_sklearn_if_available()
@@ -1,19 +1,23 @@
 import os
-import pandas as pd
+import copy
 import numpy as np
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 import sys
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from models.utils.model_io import load_model
+from models.utils.model_io import load_model_async
+from models.utils.body_rules import METRIC_COLUMNS, calculate_body_metrics, classify_ratios, measurement_record
+from models.utils.recommendations import get_recommendations
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Measurement columns the body type model was trained on, in order
+BODY_FEATURES = ("shoulder_width", "hip_width", "leg_length", "arm_length", "shoulder_hip_ratio")
+
 class BodyAnalyzer:
     """
     Class for body type analysis using trained model
@@ -26,32 +30,59 @@ class BodyAnalyzer:
             model_path: Path to the body type model file
         """
         self.model_path = model_path
-        self.model = None
+        self._model = None
+        
+        # Reusable single-row input for the model, filled in feature order
+        self._feat_order = BODY_FEATURES
+        self._feat_buf = np.empty((1, len(self._feat_order)), dtype=np.float32)
         
-        # Load model
-        self._load_model()
+        # Start loading the model in the background; it is awaited on first use
+        self._model_future = load_model_async(model_path)
+    
+    @property
+    def model(self) -> Optional[Any]:
+        """
+        Body type classification model, or None if it failed to load
+        """
+        if self._model_future is not None:
+            self._load_model()
+        return self._model
     
     def _load_model(self) -> None:
         """
         Load the body type classification model
         """
-        self.model = load_model(self.model_path)
+        self._model = self._model_future.result()
+        self._model_future = None
         
-        if self.model is None:
+        if self._model is None:
             logger.error("Failed to load body type classification model")
         else:
+            # Take the column order from the fitted model, then drop the
+            # stored names so predicting on a plain array does not warn
+            feature_names = getattr(self._model, "feature_names_in_", None)
+            if feature_names is not None:
+                self._feat_order = tuple(feature_names)
+                self._feat_buf = np.empty((1, len(self._feat_order)), dtype=np.float32)
+                # Copy first: the loaded model is shared through the load cache
+                self._model = copy.copy(self._model)
+                del self._model.feature_names_in_
+            
             logger.info("Body type classification model loaded successfully")
     
-    def analyze_body_type(self, measurements: Dict[str, float]) -> Tuple[str, Dict[str, Any]]:
+    def analyze_body_type(self, measurements: Union[Dict[str, float], np.void]) -> Tuple[str, Dict[str, Any]]:
         """
         Analyze body type from measurements
         
         Args:
-            measurements: Dictionary of body measurements
+            measurements: Dictionary of body measurements or a MEASUREMENT_DTYPE record
             
         Returns:
             Tuple of (body type, additional metrics)
         """
+        # Work on a packed record; missing measurements are NaN
+        measurements = measurement_record(measurements)
+        
         # Calculate metrics
         metrics = self._calculate_metrics(measurements)
         
@@ -61,18 +92,15 @@ class BodyAnalyzer:
             body_type = self._rule_based_classification(measurements)
         else:
             try:
-                # Create input features
-                features = pd.DataFrame([{
-                    "shoulder_width": measurements.get("shoulder_width", 0),
-                    "hip_width": measurements.get("hip_width", 0),
-                    "leg_length": measurements.get("leg_length", 0),
-                    "arm_length": measurements.get("arm_length", 0),
-                    "shoulder_hip_ratio": measurements.get("shoulder_hip_ratio", 0)
-                }])
+                # Fill input features in the model's column order, missing as 0
+                names = measurements.dtype.names
+                for i, key in enumerate(self._feat_order):
+                    self._feat_buf[0, i] = measurements[key] if key in names else 0
+                np.nan_to_num(self._feat_buf, copy=False, nan=0.0)
                 
                 # Make prediction
-                body_type = self.model.predict(features)[0]
-                logger.info(f"Body type classified as {body_type}")
+                body_type = self.model.predict(self._feat_buf)[0]
+                logger.info("Body type classified as %s", body_type)
             except Exception as e:
                 logger.error(f"Error using model for body type analysis: {e}")
                 # Fall back to rule-based classification
@@ -80,53 +108,52 @@ class BodyAnalyzer:
         
         return body_type, metrics
     
-    def _rule_based_classification(self, measurements: Dict[str, float]) -> str:
+    def _rule_based_classification(self, measurements: np.void) -> str:
         """
         Classify body type using rule-based approach
         
         Args:
-            measurements: Dictionary of body measurements
+            measurements: MEASUREMENT_DTYPE record of body measurements
             
         Returns:
             Body type classification
         """
-        ratio = measurements.get("shoulder_hip_ratio", 0)
+        ratio = np.nan_to_num(measurements["shoulder_hip_ratio"], nan=0.0)
         
-        if ratio > 1.25:
-            return "Inverted Triangle"
-        elif ratio < 0.85:
-            return "Pear"
-        else:
-            return "Rectangle"
+        # Same thresholds as the batch and ModelManager classification
+        return str(classify_ratios(ratio))
     
-    def _calculate_metrics(self, measurements: Dict[str, float]) -> Dict[str, Any]:
+    def _calculate_metrics(self, measurements: np.void) -> Dict[str, Any]:
         """
         Calculate additional metrics from measurements
         
         Args:
-            measurements: Dictionary of body measurements
+            measurements: MEASUREMENT_DTYPE record of body measurements
             
         Returns:
             Dictionary of calculated metrics
         """
-        metrics = {}
-        
-        # Calculate shoulder-to-height ratio
-        if "leg_length" in measurements:
-            height_estimate = measurements.get("leg_length", 0) * 1.5  # Rough estimate
-            if height_estimate > 0:
-                metrics["shoulder_height_ratio"] = measurements.get("shoulder_width", 0) / height_estimate
+        # Missing arm/leg lengths stay NaN so the ratios that need them drop
+        # out; missing shoulder width and torso length count as 0
+        row = np.array([[measurements[name] for name in METRIC_COLUMNS]], dtype=np.float64)
+        row[:, [0, 3]] = np.nan_to_num(row[:, [0, 3]], nan=0.0)
         
-        # Calculate arm-to-height ratio
-        if "arm_length" in measurements and "leg_length" in measurements:
-            height_estimate = measurements.get("leg_length", 0) * 1.5  # Rough estimate
-            if height_estimate > 0:
-                metrics["arm_height_ratio"] = measurements.get("arm_length", 0) / height_estimate
-        
-        # Calculate body proportions
-        metrics["upper_lower_ratio"] = measurements.get("torso_length", 0) / measurements.get("leg_length", 1)
+        batch_metrics = self.calculate_metrics_batch(row)
+        return {name: float(values[0]) for name, values in batch_metrics.items() if not np.isnan(values[0])}
+    
+    def calculate_metrics_batch(self, measurements_array: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Calculate additional metrics for many subjects at once
         
-        return metrics
+        Args:
+            measurements_array: (N, 4) array with columns in METRIC_COLUMNS order;
+                NaN marks a missing arm or leg length
+            
+        Returns:
+            Dictionary mapping metric name to an array of N values (NaN where
+            the metric cannot be computed)
+        """
+        return calculate_body_metrics(measurements_array)
     
     def get_exercise_recommendations(self, body_type: str, fitness_level: str = "Intermediate") -> List[str]:
         """
@@ -139,28 +166,4 @@ class BodyAnalyzer:
         Returns:
             List of recommended exercises
         """
-        recommendations = {
-            "Inverted Triangle": {
-                "Beginner": ["Squats", "Lunges", "Glute Bridges", "Calf Raises"],
-                "Intermediate": ["Deadlifts", "Romanian Deadlifts", "Hip Thrusts", "Step-Ups"],
-                "Advanced": ["Bulgarian Split Squats", "Pistol Squats", "Box Jumps", "Trap Bar Deadlifts"]
-            },
-            "Pear": {
-                "Beginner": ["Push-Ups", "Dumbbell Rows", "Shoulder Press", "Bicep Curls"],
-                "Intermediate": ["Bench Press", "Pull-Ups", "Lateral Raises", "Tricep Dips"],
-                "Advanced": ["Weighted Pull-Ups", "Incline Bench Press", "Military Press", "Cable Flyes"]
-            },
-            "Rectangle": {
-                "Beginner": ["Burpees", "Mountain Climbers", "Jumping Jacks", "High Knees"],
-                "Intermediate": ["Box Jumps", "Kettlebell Swings", "Plank Variations", "Medicine Ball Slams"],
-                "Advanced": ["Plyometric Push-Ups", "Tuck Jumps", "Battle Ropes", "Barbell Complexes"]
-            }
-        }
-        
-        default_recommendations = ["Push-Ups", "Squats", "Planks", "Lunges", "Mountain Climbers"]
-        
-        if body_type in recommendations and fitness_level in recommendations[body_type]:
-            return recommendations[body_type][fitness_level]
-        else:
-            logger.warning(f"No specific recommendations for {body_type} at {fitness_level} level")
-            return default_recommendations 
\ No newline at end of file
+        return get_recommendations(body_type, fitness_level) 
\ No newline at end of file
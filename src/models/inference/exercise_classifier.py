@@ -1,20 +1,25 @@
 import os
-import pandas as pd
+import copy
 import numpy as np
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 import sys
+from collections import OrderedDict
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from models.utils.model_io import load_model, load_feature_names
-from models.utils.feature_extraction import extract_pose_features, features_to_dataframe
+from models.utils.model_io import load_model, load_model_async, load_feature_names_async, export_is_current
+from models.utils.feature_extraction import extract_pose_feature_array, POSE_FEATURE_NAMES
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Feature vectors are rounded to 1/PREDICTION_CACHE_SCALE before lookup, so
+# near-identical poses from consecutive frames share a cache entry
+PREDICTION_CACHE_SCALE = 1000
+PREDICTION_CACHE_SIZE = 256
+
 class ExerciseClassifier:
     """
     Class for exercise classification using trained model
@@ -26,33 +31,114 @@ class ExerciseClassifier:
         Initialize the exercise classifier
         
         Args:
-            model_path: Path to the exercise model file
+            model_path: Path to the exercise model file; an ONNX export next
+                to it (same name, .onnx) is used instead unless it is older
             feature_names_path: Path to the feature names file
         """
         self.model_path = model_path
         self.feature_names_path = feature_names_path
-        self.model = None
-        self.feature_names = None
+        self._model = None
+        self._feature_names = None
+        self._feature_name_set = frozenset()
+        
+        # Positions of the model's features in POSE_FEATURE_NAMES, built on first use
+        self._feature_idx = None
+        self._has_missing_features = False
+        
+        # LRU of quantized feature bytes -> (exercise name, confidence)
+        self._prediction_cache: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
         
-        # Load model and feature names
-        self._load_model()
+        # Prefer the ONNX export the training script writes next to the pickle
+        onnx_path = os.path.splitext(model_path)[0] + ".onnx"
+        self._load_path = onnx_path if export_is_current(onnx_path, model_path) else model_path
+        
+        # Start loading model and feature names in the background; they are
+        # awaited on first use
+        self._load_futures = (load_model_async(self._load_path), load_feature_names_async(feature_names_path))
+    
+    @property
+    def model(self) -> Optional[Any]:
+        """
+        Exercise classification model, or None if it failed to load
+        """
+        if self._load_futures is not None:
+            self._load_model()
+        return self._model
+    
+    @property
+    def feature_names(self) -> Optional[List[str]]:
+        """
+        Model feature names, or None if they failed to load
+        """
+        if self._load_futures is not None:
+            self._load_model()
+        return self._feature_names
     
     def _load_model(self) -> None:
         """
         Load the exercise classification model
         """
-        self.model = load_model(self.model_path)
-        self.feature_names = load_feature_names(self.feature_names_path)
+        model_future, feature_names_future = self._load_futures
+        self._model = model_future.result()
+        self._feature_names = feature_names_future.result()
+        self._load_futures = None
         
-        if self.model is None:
+        if self._model is None and self._load_path != self.model_path:
+            # Fall back to the pickle if the ONNX export cannot be loaded
+            self._model = load_model(self.model_path)
+        
+        if self._model is None:
             logger.error("Failed to load exercise classification model")
         else:
+            # Inputs are arrays in feature_names order, so drop the column
+            # names stored at fit time to avoid a warning on every call
+            if hasattr(self._model, "feature_names_in_"):
+                # Copy first: the loaded model is shared through the load cache
+                self._model = copy.copy(self._model)
+                del self._model.feature_names_in_
             logger.info("Exercise classification model loaded successfully")
             
-        if self.feature_names is None:
+        if self._feature_names is None:
             logger.error("Failed to load feature names")
         else:
-            logger.info(f"Loaded {len(self.feature_names)} feature names")
+            self._feature_name_set = frozenset(self._feature_names)
+            logger.info(f"Loaded {len(self._feature_names)} feature names")
+    
+    def _get_feature_idx(self) -> np.ndarray:
+        """
+        Get the positions of the model's features in POSE_FEATURE_NAMES
+        
+        Returns:
+            Index array; features the extractor does not produce point one
+            past the end, where a zero is appended
+        """
+        if self._feature_idx is None:
+            positions = {name: i for i, name in enumerate(POSE_FEATURE_NAMES)}
+            
+            missing_features = self._feature_name_set.difference(positions)
+            if missing_features:
+                logger.warning(f"Missing features: {missing_features}")
+            self._has_missing_features = bool(missing_features)
+            
+            self._feature_idx = np.array(
+                [positions.get(name, len(POSE_FEATURE_NAMES)) for name in self.feature_names],
+                dtype=np.intp
+            )
+        return self._feature_idx
+    
+    @staticmethod
+    def _cache_key(features: np.ndarray) -> bytes:
+        """
+        Build the prediction cache key for a feature row
+        
+        Args:
+            features: Model feature row
+            
+        Returns:
+            Bytes of the features quantized to 1/PREDICTION_CACHE_SCALE
+        """
+        # int32 rather than int16: angles (up to 180) would overflow int16 at this scale
+        return np.rint(features * PREDICTION_CACHE_SCALE).astype(np.int32).tobytes()
     
     def classify_exercise(self, pose_landmarks: Any) -> Tuple[str, float]:
         """
@@ -64,40 +150,70 @@ class ExerciseClassifier:
         Returns:
             Tuple of (exercise name, confidence score)
         """
+        prediction, confidence = self.classify_exercise_batch([pose_landmarks])[0]
+        
+        if prediction != "Unknown":
+            logger.info("Exercise classified as %s with confidence %.2f", prediction, confidence)
+        return prediction, confidence
+    
+    def classify_exercise_batch(self, landmarks_list: List[Any]) -> List[Tuple[str, float]]:
+        """
+        Classify exercise type for a batch of poses with a single model call
+        
+        Args:
+            landmarks_list: List of pose landmarks from MediaPipe
+            
+        Returns:
+            List of (exercise name, confidence score) tuples, one per pose
+        """
         if self.model is None or self.feature_names is None:
             logger.error("Model or feature names not loaded")
-            return "Unknown", 0.0
+            return [("Unknown", 0.0)] * len(landmarks_list)
+        
+        if not landmarks_list:
+            return []
         
         try:
-            # Extract features from pose landmarks
-            features = extract_pose_features(pose_landmarks.landmark)
+            feature_idx = self._get_feature_idx()
             
-            # Convert to DataFrame
-            features_df = features_to_dataframe(features)
-            
-            # Select only the features used by the model
-            if set(self.feature_names).issubset(set(features_df.columns)):
-                model_input = features_df[self.feature_names]
-            else:
-                missing_features = set(self.feature_names) - set(features_df.columns)
-                logger.warning(f"Missing features: {missing_features}")
-                # Fill missing features with zeros
-                for feature in missing_features:
-                    features_df[feature] = 0
-                model_input = features_df[self.feature_names]
+            # Fill one row per pose by selecting the model's features by position
+            batch = np.empty((len(landmarks_list), len(feature_idx)), dtype=np.float32)
+            for row, pose_landmarks in zip(batch, landmarks_list):
+                raw_features = extract_pose_feature_array(pose_landmarks.landmark)
+                
+                # Missing features read a trailing zero slot, only added when needed
+                if self._has_missing_features:
+                    raw_features = np.append(raw_features, 0.0)
+                row[:] = raw_features[feature_idx]
             
-            # Make prediction
-            prediction = self.model.predict(model_input)[0]
+            # Serve repeated poses from the cache and only predict the misses
+            keys = [self._cache_key(row) for row in batch]
+            results = [self._prediction_cache.get(key) for key in keys]
+            misses = [i for i, result in enumerate(results) if result is None]
+            for i in range(len(keys)):
+                if results[i] is not None:
+                    self._prediction_cache.move_to_end(keys[i])
             
-            # Get confidence score
-            confidence = self.model.predict_proba(model_input).max()
+            if misses:
+                # One predict_proba call gives both the label and its confidence
+                probabilities = self.model.predict_proba(batch[misses])
+                best = probabilities.argmax(axis=1)
+                predictions = self.model.classes_[best]
+                confidences = probabilities[np.arange(len(best)), best]
+                
+                for i, prediction, confidence in zip(misses, predictions.tolist(), confidences.tolist()):
+                    results[i] = (prediction, confidence)
+                    self._prediction_cache[keys[i]] = results[i]
+                
+                # Evict least recently used entries
+                while len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+                    self._prediction_cache.popitem(last=False)
             
-            logger.info(f"Exercise classified as {prediction} with confidence {confidence:.2f}")
-            return prediction, float(confidence)
+            return results
             
         except Exception as e:
             logger.error(f"Error classifying exercise: {e}")
-            return "Unknown", 0.0
+            return [("Unknown", 0.0)] * len(landmarks_list)
         
     def is_valid_exercise(self, exercise: str, confidence: float, threshold: float = 0.7) -> bool:
         """
@@ -1,15 +1,39 @@
+import copy
 import pandas as pd
 import numpy as np
-import joblib
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple, Union
 from sklearn.ensemble import RandomForestClassifier
 
+from src.models.utils.model_io import (
+    OnnxModel, PackedForest, dump_compressed, load_cached, save_onnx_model, load_onnx_model,
+    save_packed_forest, load_packed_forest, single_threaded, export_is_current
+)
+from src.models.utils.body_rules import (
+    MEASUREMENT_DTYPE, classify_ratios, measurement_columns, measurement_record
+)
+from src.models.utils.data_io import read_csv
+from src.models.utils.recommendations import get_recommendations
+
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Measurement columns used by the body type model, in order
+BODY_MEASUREMENT_COLUMNS = ["shoulder_width", "hip_width", "leg_length", "arm_length"]
+
+# Bounded forests: shallow, pruned trees keep predict working sets small
+FOREST_PARAMS = {
+    "n_estimators": 100,
+    "max_depth": 12,
+    "min_samples_leaf": 5,
+    "ccp_alpha": 1e-4,
+    "n_jobs": -1,
+    "random_state": 42
+}
+
 class ModelManager:
     """
     Class for managing ML models
@@ -33,38 +57,155 @@ class ModelManager:
         self.body_model = None
         self.feature_names = None
         
+        # Reusable single-row model inputs; the exercise row is sized on first use.
+        # The lock guards them when one manager is shared between sessions
+        self._exercise_buf = None
+        self._body_buf = np.empty((1, len(BODY_MEASUREMENT_COLUMNS)), dtype=np.float32)
+        self._buf_lock = threading.Lock()
+        
         # Try to load models
         self._load_models()
         
     def _load_models(self) -> None:
         """
-        Load models from disk
+        Load models from disk, reading the three files in parallel
         """
         try:
-            # Load exercise classifier model
-            if os.path.exists(self.exercise_model_path):
-                self.exercise_model = joblib.load(self.exercise_model_path)
-                logger.info(f"Exercise model loaded from {self.exercise_model_path}")
-            else:
-                logger.warning(f"Exercise model file not found at {self.exercise_model_path}")
-            
-            # Load body type model
-            if os.path.exists(self.body_model_path):
-                self.body_model = joblib.load(self.body_model_path)
-                logger.info(f"Body model loaded from {self.body_model_path}")
-            else:
-                logger.warning(f"Body model file not found at {self.body_model_path}")
-            
-            # Load feature names
-            if os.path.exists(self.feature_names_path):
-                self.feature_names = joblib.load(self.feature_names_path)
-                logger.info(f"Feature names loaded from {self.feature_names_path}")
-            else:
-                logger.warning(f"Feature names file not found at {self.feature_names_path}")
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [
+                    executor.submit(self._load_exercise_model),
+                    executor.submit(self._load_body_model),
+                    executor.submit(self._load_feature_names)
+                ]
+                for future in futures:
+                    future.result()
                 
         except Exception as e:
             logger.error(f"Error loading models: {e}")
     
+    def _load_exercise_model(self) -> None:
+        """
+        Load the exercise classifier model, preferring the ONNX export, then
+        the packed forest, then the pickle; exports older than the pickle are ignored
+        """
+        onnx_path = self._onnx_path(self.exercise_model_path)
+        if export_is_current(onnx_path, self.exercise_model_path):
+            self.exercise_model = load_onnx_model(onnx_path)
+        forest_dir = self._forest_dir(self.exercise_model_path)
+        if self.exercise_model is None and export_is_current(forest_dir, self.exercise_model_path):
+            self.exercise_model = load_packed_forest(forest_dir)
+        
+        if self.exercise_model is not None:
+            logger.info(f"Exercise model loaded from export of {self.exercise_model_path}")
+        elif os.path.exists(self.exercise_model_path):
+            self.exercise_model = self._drop_feature_names(load_cached(self.exercise_model_path))
+            logger.info(f"Exercise model loaded from {self.exercise_model_path}")
+        else:
+            logger.warning(f"Exercise model file not found at {self.exercise_model_path}")
+    
+    def _load_body_model(self) -> None:
+        """
+        Load the body type model, preferring the packed forest unless it is
+        older than the pickle
+        """
+        forest_dir = self._forest_dir(self.body_model_path)
+        if export_is_current(forest_dir, self.body_model_path):
+            self.body_model = load_packed_forest(forest_dir)
+        if self.body_model is not None:
+            logger.info(f"Body model loaded from export of {self.body_model_path}")
+        elif os.path.exists(self.body_model_path):
+            self.body_model = self._drop_feature_names(load_cached(self.body_model_path))
+            logger.info(f"Body model loaded from {self.body_model_path}")
+        else:
+            logger.warning(f"Body model file not found at {self.body_model_path}")
+    
+    def _load_feature_names(self) -> None:
+        """
+        Load the exercise model feature names
+        """
+        if os.path.exists(self.feature_names_path):
+            self.feature_names = list(load_cached(self.feature_names_path))
+            logger.info(f"Feature names loaded from {self.feature_names_path}")
+        else:
+            logger.warning(f"Feature names file not found at {self.feature_names_path}")
+    
+    def _onnx_path(self, model_path: str) -> str:
+        """
+        Get the path of the ONNX export that sits next to a model file
+        
+        Args:
+            model_path: Path to the pickled model
+            
+        Returns:
+            Path with the extension replaced by .onnx
+        """
+        return os.path.splitext(model_path)[0] + ".onnx"
+    
+    def _forest_dir(self, model_path: str) -> str:
+        """
+        Get the directory of the packed forest that sits next to a model file
+        
+        Args:
+            model_path: Path to the pickled model
+            
+        Returns:
+            Path with the extension replaced by .forest
+        """
+        return os.path.splitext(model_path)[0] + ".forest"
+    
+    def _export_packed_forest(self, model: Any, model_path: str) -> None:
+        """
+        Pack a forest model next to its pickle, removing any stale packed
+        copy if the model cannot be packed
+        
+        Args:
+            model: Fitted model
+            model_path: Path to the pickled model
+        """
+        forest_dir = self._forest_dir(model_path)
+        if save_packed_forest(model, forest_dir):
+            return
+        
+        # Never leave an outdated copy that _load_models would prefer
+        if os.path.isdir(forest_dir):
+            import shutil
+            shutil.rmtree(forest_dir)
+            logger.info(f"Removed stale packed forest {forest_dir}")
+    
+    def _drop_feature_names(self, model: Any) -> Any:
+        """
+        Remove the column names stored at fit time, since the models are
+        queried with plain arrays in feature_names / BODY_MEASUREMENT_COLUMNS
+        order, and make the model predict on a single thread
+        
+        Args:
+            model: Fitted model
+            
+        Returns:
+            The model, or a shallow copy without feature_names_in_ and with
+            n_jobs=1 so a shared cached model is left untouched
+        """
+        model = single_threaded(model)
+        if hasattr(model, "feature_names_in_"):
+            model = copy.copy(model)
+            del model.feature_names_in_
+        return model
+    
+    def _export_exercise_onnx(self) -> None:
+        """
+        Export the exercise model to ONNX next to its pickle, removing any
+        stale export if the conversion is not possible
+        """
+        onnx_path = self._onnx_path(self.exercise_model_path)
+        if self.feature_names is not None and save_onnx_model(
+                self.exercise_model, len(self.feature_names), onnx_path):
+            return
+        
+        # Never leave an outdated export that _load_models would prefer
+        if os.path.exists(onnx_path):
+            os.remove(onnx_path)
+            logger.info(f"Removed stale ONNX model {onnx_path}")
+    
     def identify_exercise(self, features: Dict[str, float]) -> Tuple[str, float]:
         """
         Identify exercise type from pose landmarks
@@ -80,65 +221,97 @@ class ModelManager:
             return "Unknown", 0.0
         
         try:
-            # Convert features to DataFrame
-            df = pd.DataFrame([features])
-            
-            # Select only the features used by the model
-            if self.feature_names is not None:
-                df = df[self.feature_names]
-            
-            # Make prediction
-            prediction = self.exercise_model.predict(df)[0]
-            
-            # Get confidence score
-            confidence = self.exercise_model.predict_proba(df).max()
+            # Fill the reusable input row in the model's feature order, missing as 0
+            names = self.feature_names if self.feature_names is not None else list(features)
+            with self._buf_lock:
+                if self._exercise_buf is None or self._exercise_buf.shape[1] != len(names):
+                    self._exercise_buf = np.empty((1, len(names)), dtype=np.float32)
+                model_input = self._exercise_buf
+                for i, name in enumerate(names):
+                    model_input[0, i] = features.get(name, 0.0)
+                
+                # One predict_proba call gives both the label and its confidence
+                probabilities = self.exercise_model.predict_proba(model_input)
+            best = int(probabilities[0].argmax())
+            # ONNX and packed forest labels are np.str_; return a plain str from every backend
+            prediction = str(self.exercise_model.classes_[best])
+            confidence = float(probabilities[0, best])
             
-            logger.info(f"Exercise identified as {prediction} with confidence {confidence:.2f}")
-            return prediction, float(confidence)
+            logger.info("Exercise identified as %s with confidence %.2f", prediction, confidence)
+            return prediction, confidence
             
         except Exception as e:
             logger.error(f"Error identifying exercise: {e}")
             return "Unknown", 0.0
     
-    def classify_body_type(self, measurements: Dict[str, float]) -> str:
+    def classify_body_type(self, measurements: Union[Dict[str, float], np.void]) -> str:
         """
         Classify body type from measurements
         
         Args:
-            measurements: Dictionary of body measurements
+            measurements: Dictionary of body measurements or a MEASUREMENT_DTYPE record
             
         Returns:
             Body type classification
         """
+        # Work on a packed record; missing measurements are NaN
+        measurements = measurement_record(measurements)
+        
         if self.body_model is None:
             logger.warning("Body model not loaded, using rule-based classification")
             # Use rule-based classification
-            ratio = measurements.get("shoulder_hip_ratio", 0)
-            if ratio > 1.25:
-                return "Inverted Triangle"
-            elif ratio < 0.85:
-                return "Pear"
-            else:
-                return "Rectangle"
+            ratio = np.nan_to_num(measurements["shoulder_hip_ratio"], nan=0.0)
+            return str(classify_ratios(ratio))
         
         try:
-            # Create a DataFrame with the measurements
-            df = pd.DataFrame([{
-                "shoulder_width": measurements.get("shoulder_width", 0),
-                "hip_width": measurements.get("hip_width", 0),
-                "leg_length": measurements.get("leg_length", 0),
-                "arm_length": measurements.get("arm_length", 0)
-            }])
-            
-            # Make prediction
-            body_type = self.body_model.predict(df)[0]
-            logger.info(f"Body type classified as {body_type}")
+            with self._buf_lock:
+                # Fill the reusable input row with the measurements, missing as 0
+                for i, column in enumerate(BODY_MEASUREMENT_COLUMNS):
+                    self._body_buf[0, i] = measurements[column]
+                np.nan_to_num(self._body_buf, copy=False, nan=0.0)
+                
+                # Make prediction
+                body_type = str(self.body_model.predict(self._body_buf)[0])
+            logger.info("Body type classified as %s", body_type)
             return body_type
             
         except Exception as e:
             logger.error(f"Error classifying body type: {e}")
             return "Unknown"
     
+    def classify_body_type_batch(self, measurements_array: np.ndarray) -> np.ndarray:
+        """
+        Classify body types for many subjects at once
+        
+        Args:
+            measurements_array: (N, 4) array with columns in
+                BODY_MEASUREMENT_COLUMNS order, or an array of N
+                MEASUREMENT_DTYPE records
+            
+        Returns:
+            Array of N body type classifications
+        """
+        if getattr(measurements_array, "dtype", None) == MEASUREMENT_DTYPE:
+            measurements_array = measurement_columns(measurements_array, BODY_MEASUREMENT_COLUMNS)
+        measurements_array = np.asarray(measurements_array, dtype=np.float64)
+        
+        if self.body_model is None:
+            logger.warning("Body model not loaded, using rule-based classification")
+            # Use rule-based classification on the shoulder-to-hip ratio
+            shoulder, hip = measurements_array[:, 0], measurements_array[:, 1]
+            ratio = np.divide(shoulder, hip, out=np.zeros_like(shoulder), where=hip > 0)
+            return classify_ratios(ratio)
+        
+        try:
+            # Make predictions for the whole batch in one call
+            body_types = self.body_model.predict(measurements_array)
+            logger.info("Classified body type for %d subjects", len(body_types))
+            return body_types
+            
+        except Exception as e:
+            logger.error(f"Error classifying body types: {e}")
+            return np.full(len(measurements_array), "Unknown", dtype=object)
+    
     def get_exercise_recommendations(self, body_type: str, fitness_level: str = "Intermediate") -> List[str]:
         """
         Get exercise recommendations based on body type
@@ -150,31 +323,7 @@ class ModelManager:
         Returns:
             List of recommended exercises
         """
-        recommendations = {
-            "Inverted Triangle": {
-                "Beginner": ["Squats", "Lunges", "Glute Bridges", "Calf Raises"],
-                "Intermediate": ["Deadlifts", "Romanian Deadlifts", "Hip Thrusts", "Step-Ups"],
-                "Advanced": ["Bulgarian Split Squats", "Pistol Squats", "Box Jumps", "Trap Bar Deadlifts"]
-            },
-            "Pear": {
-                "Beginner": ["Push-Ups", "Dumbbell Rows", "Shoulder Press", "Bicep Curls"],
-                "Intermediate": ["Bench Press", "Pull-Ups", "Lateral Raises", "Tricep Dips"],
-                "Advanced": ["Weighted Pull-Ups", "Incline Bench Press", "Military Press", "Cable Flyes"]
-            },
-            "Rectangle": {
-                "Beginner": ["Burpees", "Mountain Climbers", "Jumping Jacks", "High Knees"],
-                "Intermediate": ["Box Jumps", "Kettlebell Swings", "Plank Variations", "Medicine Ball Slams"],
-                "Advanced": ["Plyometric Push-Ups", "Tuck Jumps", "Battle Ropes", "Barbell Complexes"]
-            }
-        }
-        
-        default_recommendations = ["Push-Ups", "Squats", "Planks", "Lunges", "Mountain Climbers"]
-        
-        if body_type in recommendations and fitness_level in recommendations[body_type]:
-            return recommendations[body_type][fitness_level]
-        else:
-            logger.warning(f"No specific recommendations for {body_type} at {fitness_level} level")
-            return default_recommendations
+        return get_recommendations(body_type, fitness_level)
     
     def train_exercise_model(self, training_data: pd.DataFrame) -> None:
         """
@@ -196,13 +345,15 @@ class ModelManager:
             self.feature_names = X.columns.tolist()
             
             # Train model
-            model = RandomForestClassifier(n_estimators=100, random_state=42)
+            model = RandomForestClassifier(**FOREST_PARAMS)
             model.fit(X, y)
             
             # Save model
-            self.exercise_model = model
-            joblib.dump(model, self.exercise_model_path)
-            joblib.dump(self.feature_names, self.feature_names_path)
+            self.exercise_model = self._drop_feature_names(model)
+            dump_compressed(model, self.exercise_model_path)
+            dump_compressed(self.feature_names, self.feature_names_path)
+            self._export_exercise_onnx()
+            self._export_packed_forest(model, self.exercise_model_path)
             
             logger.info(f"Exercise model trained and saved to {self.exercise_model_path}")
             
@@ -226,12 +377,13 @@ class ModelManager:
             y = training_data["body_type"]
             
             # Train model
-            model = RandomForestClassifier(n_estimators=100, random_state=42)
+            model = RandomForestClassifier(**FOREST_PARAMS)
             model.fit(X, y)
             
             # Save model
-            self.body_model = model
-            joblib.dump(model, self.body_model_path)
+            self.body_model = self._drop_feature_names(model)
+            dump_compressed(model, self.body_model_path)
+            self._export_packed_forest(model, self.body_model_path)
             
             logger.info(f"Body model trained and saved to {self.body_model_path}")
             
@@ -243,16 +395,22 @@ class ModelManager:
         Save models to disk
         """
         try:
-            if self.exercise_model is not None:
-                joblib.dump(self.exercise_model, self.exercise_model_path)
+            # A model loaded from one of its exports is already saved
+            if self.exercise_model is not None and not isinstance(self.exercise_model, (OnnxModel, PackedForest)):
+                dump_compressed(self.exercise_model, self.exercise_model_path)
                 logger.info(f"Exercise model saved to {self.exercise_model_path}")
+                
+                self._export_exercise_onnx()
+                self._export_packed_forest(self.exercise_model, self.exercise_model_path)
             
-            if self.body_model is not None:
-                joblib.dump(self.body_model, self.body_model_path)
+            if self.body_model is not None and not isinstance(self.body_model, PackedForest):
+                dump_compressed(self.body_model, self.body_model_path)
                 logger.info(f"Body model saved to {self.body_model_path}")
+                
+                self._export_packed_forest(self.body_model, self.body_model_path)
             
             if self.feature_names is not None:
-                joblib.dump(self.feature_names, self.feature_names_path)
+                dump_compressed(self.feature_names, self.feature_names_path)
                 logger.info(f"Feature names saved to {self.feature_names_path}")
                 
         except Exception as e:
@@ -269,7 +427,7 @@ class ModelManager:
             DataFrame containing exercise data
         """
         try:
-            data = pd.read_csv(path)
+            data = read_csv(path)
             logger.info(f"Loaded {len(data)} exercise samples from {path}")
             return data
         except Exception as e:
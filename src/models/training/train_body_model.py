@@ -1,22 +1,31 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import logging
 from typing import Dict, List, Any, Optional, Tuple
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.metrics import classification_report, accuracy_score
-import sys
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+# Patch scikit-learn with oneDAL (scikit-learn-intelex) before importing estimators
+from models.utils.sklearn_patch import patch_sklearn_if_available
+patch_sklearn_if_available()
+
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.model_selection import StratifiedShuffleSplit, GridSearchCV
+from sklearn.metrics import classification_report, accuracy_score
+
 from models.utils.model_io import save_model
+from models.utils.data_io import read_csv
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Column order of the feature matrix returned by preprocess_body_data
+BODY_FEATURE_COLUMNS = ["shoulder_width", "hip_width", "leg_length", "arm_length", "shoulder_hip_ratio"]
+
 def load_body_data(data_path: str) -> Optional[pd.DataFrame]:
     """
     Load body measurement data from CSV
@@ -32,14 +41,14 @@ def load_body_data(data_path: str) -> Optional[pd.DataFrame]:
             logger.error(f"Body data file not found at {data_path}")
             return None
             
-        data = pd.read_csv(data_path)
+        data = read_csv(data_path)
         logger.info(f"Loaded {len(data)} body measurement samples from {data_path}")
         return data
     except Exception as e:
         logger.error(f"Error loading body data: {e}")
         return None
 
-def preprocess_body_data(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+def preprocess_body_data(data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
     """
     Preprocess body measurement data
     
@@ -47,7 +56,8 @@ def preprocess_body_data(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
         data: DataFrame containing body measurement data
         
     Returns:
-        Tuple of (features DataFrame, target Series)
+        Tuple of (C-contiguous float32 feature array in BODY_FEATURE_COLUMNS
+        order, target array)
     """
     try:
         if "body_type" not in data.columns:
@@ -64,53 +74,84 @@ def preprocess_body_data(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
                 raise ValueError(f"Required column '{column}' not found in training data")
         
         # Split features and target
-        X = data[required_columns]
+        X = data[required_columns].copy()
         y = data["body_type"]
         
         # Add derived features
         X["shoulder_hip_ratio"] = X["shoulder_width"] / X["hip_width"]
         
-        logger.info(f"Preprocessed data: {X.shape[0]} samples, {X.shape[1]} features")
-        return X, y
+        # Materialize one row-major float32 matrix so the trees don't copy it again
+        X_arr = np.ascontiguousarray(X[BODY_FEATURE_COLUMNS].to_numpy(dtype=np.float32))
+        
+        logger.info(f"Preprocessed data: {X_arr.shape[0]} samples, {X_arr.shape[1]} features")
+        return X_arr, y.to_numpy()
     except Exception as e:
         logger.error(f"Error preprocessing body data: {e}")
         raise
 
 def train_body_type_model(
-    X: pd.DataFrame, 
-    y: pd.Series, 
+    X: np.ndarray, 
+    y: np.ndarray, 
     params: Optional[Dict[str, Any]] = None,
-    use_grid_search: bool = False
+    use_grid_search: bool = False,
+    model_type: str = "hist",
+    validate: bool = True
 ) -> Any:
     """
     Train body type classification model
     
     Args:
-        X: Features DataFrame
-        y: Target Series
+        X: Feature array in BODY_FEATURE_COLUMNS order
+        y: Target array
         params: Model hyperparameters
         use_grid_search: Whether to use grid search for hyperparameter tuning
+            (random forest only)
+        model_type: "hist" for a small histogram gradient boosting model or
+            "random_forest"
+        validate: Whether to hold out a validation split and log accuracy,
+            the classification report and feature importances. Pass False
+            for production retraining on all of the data
         
     Returns:
         Trained model
     """
     try:
+        if model_type not in ("hist", "random_forest"):
+            raise ValueError(f"Unknown model type '{model_type}'")
+        
         # Default parameters
-        if params is None:
+        if params is None and model_type == "hist":
+            # A few shallow boosted trees are plenty for 5 features and 3 classes.
+            # Leaves scale with the data: the default of 20 samples per leaf
+            # stops small datasets from splitting at all
+            params = {
+                "max_iter": 50,
+                "max_depth": 4,
+                "max_leaf_nodes": 15,
+                "min_samples_leaf": max(1, len(y) // 10),
+                "learning_rate": 0.1,
+                "random_state": 42
+            }
+        elif params is None:
             params = {
                 "n_estimators": 100,
-                "max_depth": None,
+                "max_depth": 12,
                 "min_samples_split": 2,
-                "min_samples_leaf": 1,
+                "min_samples_leaf": 5,
+                "ccp_alpha": 1e-4,
+                "n_jobs": -1,
                 "random_state": 42
             }
             
-        # Split data into train and validation sets
-        X_train, X_val, y_train, y_val = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
-        )
+        if validate:
+            # Split data into train and validation sets by stratified row indices
+            splitter = StratifiedShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+            train_idx, val_idx = next(splitter.split(X, y))
+            X_train, y_train = X[train_idx], y[train_idx]
+        else:
+            X_train, y_train = X, y
         
-        if use_grid_search:
+        if use_grid_search and model_type == "random_forest":
             # Define parameter grid
             param_grid = {
                 "n_estimators": [50, 100, 200],
@@ -140,8 +181,12 @@ def train_body_type_model(
             best_params = grid_search.best_params_
             logger.info(f"Best parameters: {best_params}")
             
-            # Train model with best parameters
+            # Train model with best parameters, building trees on all cores
+            best_params["n_jobs"] = -1
             model = RandomForestClassifier(**best_params)
+        elif model_type == "hist":
+            # Train histogram gradient boosting model with provided parameters
+            model = HistGradientBoostingClassifier(**params)
         else:
             # Train model with provided parameters
             model = RandomForestClassifier(**params)
@@ -150,19 +195,24 @@ def train_body_type_model(
         logger.info("Training body type classification model...")
         model.fit(X_train, y_train)
         
+        if not validate:
+            return model
+        
         # Evaluate model
+        X_val, y_val = X[val_idx], y[val_idx]
         y_pred = model.predict(X_val)
         accuracy = accuracy_score(y_val, y_pred)
         logger.info(f"Model accuracy: {accuracy:.4f}")
         logger.info("\nClassification Report:\n" + classification_report(y_val, y_pred))
         
-        # Get feature importances
-        feature_importances = pd.DataFrame({
-            'Feature': X.columns,
-            'Importance': model.feature_importances_
-        }).sort_values('Importance', ascending=False)
-        
-        logger.info("\nFeature Importances:\n" + str(feature_importances))
+        # Get feature importances (not exposed by gradient boosting models)
+        if hasattr(model, "feature_importances_"):
+            feature_importances = pd.DataFrame({
+                'Feature': BODY_FEATURE_COLUMNS,
+                'Importance': model.feature_importances_
+            }).sort_values('Importance', ascending=False)
+            
+            logger.info("\nFeature Importances:\n" + str(feature_importances))
         
         return model
     except Exception as e:
@@ -1,17 +1,25 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import logging
 from typing import Dict, List, Any, Optional, Tuple
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.metrics import classification_report, accuracy_score
-import sys
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from models.utils.model_io import save_model, save_feature_names
+# Patch scikit-learn with oneDAL (scikit-learn-intelex) before importing estimators
+from models.utils.sklearn_patch import patch_sklearn_if_available
+patch_sklearn_if_available()
+
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import train_test_split, HalvingGridSearchCV
+from sklearn.metrics import classification_report, accuracy_score
+
+from models.utils.model_io import save_model, save_feature_names, save_onnx_model
+from models.utils.data_io import read_csv
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -32,14 +40,14 @@ def load_training_data(data_path: str) -> Optional[pd.DataFrame]:
             logger.error(f"Training data file not found at {data_path}")
             return None
             
-        data = pd.read_csv(data_path)
+        data = read_csv(data_path)
         logger.info(f"Loaded {len(data)} training samples from {data_path}")
         return data
     except Exception as e:
         logger.error(f"Error loading training data: {e}")
         return None
 
-def preprocess_data(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, List[str]]:
+def preprocess_data(data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, List[str]]:
     """
     Preprocess training data
     
@@ -47,7 +55,8 @@ def preprocess_data(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, List[s
         data: DataFrame containing training data
         
     Returns:
-        Tuple of (features DataFrame, target Series, feature names list)
+        Tuple of (C-contiguous float32 feature array, target array, feature
+        names list in column order)
     """
     try:
         if "exercise" not in data.columns:
@@ -61,65 +70,159 @@ def preprocess_data(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, List[s
         # Get feature names
         feature_names = X.columns.tolist()
         
-        logger.info(f"Preprocessed data: {X.shape[0]} samples, {X.shape[1]} features")
-        return X, y, feature_names
+        # Materialize one row-major float32 matrix so the trees don't copy it again
+        X_arr = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+        
+        logger.info(f"Preprocessed data: {X_arr.shape[0]} samples, {X_arr.shape[1]} features")
+        return X_arr, y.to_numpy(), feature_names
     except Exception as e:
         logger.error(f"Error preprocessing data: {e}")
         raise
 
+def split_data(X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split data into the train and validation sets used throughout training
+    
+    Args:
+        X: Feature array
+        y: Target array
+        
+    Returns:
+        Tuple of (X_train, X_val, y_train, y_val)
+    """
+    return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+def select_features(X: np.ndarray, y: np.ndarray, feature_names: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Keep only the features with above-average importance
+    
+    Importances are the mean decrease in impurity of a quick random forest
+    fit on the training split from split_data only, so the validation rows
+    do not influence which columns are kept. The kept columns are taken from
+    all rows, and train_exercise_model splits them the same way.
+    
+    Args:
+        X: Feature array in feature names order
+        y: Target array
+        feature_names: Feature names in column order
+        
+    Returns:
+        Tuple of (C-contiguous array of the kept columns, kept feature names
+        in column order)
+    """
+    try:
+        # Rank features with a small forest built on all cores
+        ranker = RandomForestClassifier(
+            n_estimators=50,
+            max_depth=12,
+            min_samples_leaf=5,
+            n_jobs=-1,
+            random_state=42
+        )
+        X_train, _, y_train, _ = split_data(X, y)
+        ranker.fit(X_train, y_train)
+        importances = ranker.feature_importances_
+        
+        keep = np.flatnonzero(importances > importances.mean())
+        logger.info(f"Selected {len(keep)} of {len(feature_names)} features")
+        return np.ascontiguousarray(X[:, keep]), [feature_names[i] for i in keep]
+    except Exception as e:
+        logger.error(f"Error selecting features: {e}")
+        raise
+
 def train_exercise_model(
-    X: pd.DataFrame, 
-    y: pd.Series, 
+    X: np.ndarray, 
+    y: np.ndarray, 
     params: Optional[Dict[str, Any]] = None,
-    use_grid_search: bool = False
+    use_grid_search: bool = False,
+    model_type: str = "random_forest"
 ) -> Any:
     """
     Train exercise classification model
     
+    Random forest trees are depth-capped and consider sqrt(n_features)
+    candidates per split. Fully grown trees mostly add variance (they fit
+    noise in the landmarks) while making training, prediction and the saved
+    model grow with the tree size; the cap trades a little bias for that.
+    
     Args:
-        X: Features DataFrame
-        y: Target Series
+        X: Feature array in feature names order
+        y: Target array
         params: Model hyperparameters
         use_grid_search: Whether to use grid search for hyperparameter tuning
+        model_type: "random_forest" or "hist" for histogram gradient boosting
+            (features are binned once, so split search is a histogram scan).
+            Hist params use HistGradientBoostingClassifier names
         
     Returns:
         Trained model
     """
     try:
+        if model_type not in ("hist", "random_forest"):
+            raise ValueError(f"Unknown model type '{model_type}'")
+        
         # Default parameters
-        if params is None:
+        if params is None and model_type == "hist":
+            # Hold out 10% of the training split for early stopping
             params = {
-                "n_estimators": 100,
+                "max_iter": 100,
                 "max_depth": None,
+                "early_stopping": True,
+                "validation_fraction": 0.1,
+                "random_state": 42
+            }
+        elif params is None:
+            params = {
+                "n_estimators": 100,
+                "max_depth": 12,
                 "min_samples_split": 2,
-                "min_samples_leaf": 1,
+                "min_samples_leaf": 5,
+                "max_features": "sqrt",
+                "ccp_alpha": 1e-4,
+                "n_jobs": -1,
                 "random_state": 42
             }
             
         # Split data into train and validation sets
-        X_train, X_val, y_train, y_val = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
-        )
+        X_train, X_val, y_train, y_val = split_data(X, y)
         
-        if use_grid_search:
+        if use_grid_search and model_type == "hist":
+            # Define parameter grid
+            param_grid = {
+                "learning_rate": [0.05, 0.1, 0.2],
+                "max_leaf_nodes": [15, 31, 63],
+                "l2_regularization": [0.0, 0.1, 1.0]
+            }
+            
+            # Create base model
+            base_model = HistGradientBoostingClassifier(**params)
+        elif use_grid_search:
             # Define parameter grid
             param_grid = {
                 "n_estimators": [50, 100, 200],
-                "max_depth": [None, 10, 20, 30],
+                "max_depth": [10, 15, 20],
                 "min_samples_split": [2, 5, 10],
                 "min_samples_leaf": [1, 2, 4]
             }
             
             # Create base model
             base_model = RandomForestClassifier(random_state=42)
-            
-            # Create grid search
-            grid_search = GridSearchCV(
+        
+        if use_grid_search:
+            # Create successive-halving grid search: every candidate starts on a
+            # small sample and only the best third move on to 3x the samples.
+            # Only the CV fits run in parallel, so the search's own refit is
+            # kept for gradient boosting but done below for the forest
+            grid_search = HalvingGridSearchCV(
                 base_model,
                 param_grid,
                 cv=5,
+                factor=3,
+                resource="n_samples",
+                min_resources="exhaust",
                 scoring="accuracy",
                 n_jobs=-1,
+                refit=model_type == "hist",
                 verbose=1
             )
             
@@ -131,15 +234,23 @@ def train_exercise_model(
             best_params = grid_search.best_params_
             logger.info(f"Best parameters: {best_params}")
             
-            # Train model with best parameters
-            model = RandomForestClassifier(**best_params)
+            if model_type == "hist":
+                # The search already refits the best candidate on the training split
+                model = grid_search.best_estimator_
+            else:
+                # Refit the best forest with its trees built on all cores
+                model = clone(base_model).set_params(**best_params, n_jobs=-1)
+        elif model_type == "hist":
+            # Train histogram gradient boosting model with provided parameters
+            model = HistGradientBoostingClassifier(**params)
         else:
             # Train model with provided parameters
             model = RandomForestClassifier(**params)
             
-        # Fit model
-        logger.info("Training exercise classification model...")
-        model.fit(X_train, y_train)
+        # Fit model, unless the search already refit it
+        if not (use_grid_search and model_type == "hist"):
+            logger.info("Training exercise classification model...")
+            model.fit(X_train, y_train)
         
         # Evaluate model
         y_pred = model.predict(X_val)
@@ -167,6 +278,10 @@ def main():
         # Preprocess data
         X, y, feature_names = preprocess_data(data)
         
+        # Drop low-importance features; inference picks columns by the saved
+        # feature names, so only the kept ones are computed into the model input
+        X, feature_names = select_features(X, y, feature_names)
+        
         # Train model
         model = train_exercise_model(X, y, use_grid_search=False)
         
@@ -177,6 +292,13 @@ def main():
         save_model(model, model_path)
         save_feature_names(feature_names, feature_names_path)
         
+        # Export for ONNX Runtime inference; ExerciseClassifier prefers it over
+        # the pickle, so never leave an outdated export next to the new pickle
+        onnx_path = os.path.join("models_data", "exercise_model.onnx")
+        if not save_onnx_model(model, X.shape[1], onnx_path) and os.path.exists(onnx_path):
+            os.remove(onnx_path)
+            logger.info(f"Removed stale ONNX model {onnx_path}")
+        
         logger.info("Exercise model training completed successfully")
     except Exception as e:
         logger.error(f"Error in main function: {e}")
@@ -0,0 +1,125 @@
+import numpy as np
+from numpy.lib import recfunctions
+from typing import Dict, Mapping, Sequence, Union
+
+# Rule-based body types, indexed by the codes from body_type_codes
+BODY_TYPE_LABELS = np.array(["Pear", "Rectangle", "Inverted Triangle"])
+
+# Shoulder-to-hip ratios above INVERTED_TRIANGLE_RATIO are Inverted Triangle,
+# below PEAR_RATIO Pear, and Rectangle in between
+INVERTED_TRIANGLE_RATIO = 1.25
+PEAR_RATIO = 0.85
+
+# Measurement columns used by calculate_body_metrics, in order
+METRIC_COLUMNS = ("shoulder_width", "arm_length", "leg_length", "torso_length")
+
+# Packed record layout for body measurements; NaN marks a missing value
+MEASUREMENT_DTYPE = np.dtype([
+    ("shoulder_width", "f4"),
+    ("hip_width", "f4"),
+    ("leg_length", "f4"),
+    ("arm_length", "f4"),
+    ("torso_length", "f4"),
+    ("shoulder_hip_ratio", "f4")
+])
+
+def measurement_record(measurements: Union[Mapping[str, float], np.void, np.ndarray]) -> np.void:
+    """
+    Convert body measurements to a single MEASUREMENT_DTYPE record
+    
+    Args:
+        measurements: Dictionary of body measurements, or a record/0-d array
+            of MEASUREMENT_DTYPE (returned as-is)
+        
+    Returns:
+        Measurement record with NaN for measurements that are not given
+    """
+    if isinstance(measurements, (np.void, np.ndarray)) and measurements.dtype == MEASUREMENT_DTYPE:
+        return measurements[()]
+    
+    record = np.full((), np.nan, dtype=MEASUREMENT_DTYPE)
+    for name in MEASUREMENT_DTYPE.names:
+        if name in measurements:
+            record[name] = measurements[name]
+    return record[()]
+
+def measurement_columns(records: np.ndarray, columns: Sequence[str]) -> np.ndarray:
+    """
+    Select fields of a MEASUREMENT_DTYPE array as a plain 2D array
+    
+    Args:
+        records: Array of MEASUREMENT_DTYPE records
+        columns: Field names to select, in output column order
+        
+    Returns:
+        (N, len(columns)) float64 array
+    """
+    records = np.atleast_1d(records)
+    return recfunctions.structured_to_unstructured(records[list(columns)], dtype=np.float64)
+
+def body_type_codes(ratios: np.ndarray) -> np.ndarray:
+    """
+    Map shoulder-to-hip ratios to integer body type codes
+    
+    Args:
+        ratios: Array of shoulder-to-hip ratios
+        
+    Returns:
+        int8 array of indices into BODY_TYPE_LABELS (0 Pear, 1 Rectangle,
+        2 Inverted Triangle)
+    """
+    ratios = np.asarray(ratios, dtype=np.float64)
+    
+    # Start from Rectangle and step up/down across the thresholds
+    codes = np.ones(ratios.shape, dtype=np.int8)
+    codes += ratios > INVERTED_TRIANGLE_RATIO
+    codes -= ratios < PEAR_RATIO
+    return codes
+
+def classify_ratios(ratios: np.ndarray) -> np.ndarray:
+    """
+    Rule-based body type classification for an array of ratios
+    
+    Args:
+        ratios: Array of shoulder-to-hip ratios
+        
+    Returns:
+        Array of body type labels
+    """
+    return BODY_TYPE_LABELS[body_type_codes(ratios)]
+
+def calculate_body_metrics(measurements_array: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculate body proportion metrics for many subjects at once
+    
+    Args:
+        measurements_array: (N, 4) array with columns in METRIC_COLUMNS order;
+            NaN marks a missing arm or leg length
+        
+    Returns:
+        Dictionary mapping metric name to an array of N values (NaN where
+        the metric cannot be computed)
+    """
+    measurements_array = np.asarray(measurements_array, dtype=np.float64)
+    shoulder, arm, leg, torso = measurements_array.T
+    
+    # Rough height estimate from leg length
+    height_estimate = leg * 1.5
+    valid_height = height_estimate > 0
+    
+    # Calculate shoulder-to-height and arm-to-height ratios
+    shoulder_height_ratio = np.divide(shoulder, height_estimate,
+                                      out=np.full_like(shoulder, np.nan), where=valid_height)
+    arm_height_ratio = np.divide(arm, height_estimate,
+                                 out=np.full_like(arm, np.nan), where=valid_height)
+    
+    # Calculate body proportions (a missing leg length counts as 1)
+    leg_or_one = np.where(np.isnan(leg), 1.0, leg)
+    upper_lower_ratio = np.divide(torso, leg_or_one,
+                                  out=np.zeros_like(torso), where=leg_or_one != 0)
+    
+    return {
+        "shoulder_height_ratio": shoulder_height_ratio,
+        "arm_height_ratio": arm_height_ratio,
+        "upper_lower_ratio": upper_lower_ratio
+    }
@@ -0,0 +1,46 @@
+import pandas as pd
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+def read_csv(path: str) -> pd.DataFrame:
+    """
+    Read a CSV file into a pandas DataFrame, using the multithreaded polars
+    parser when it is installed, else pandas' pyarrow engine when pyarrow is
+    installed, else the default pandas parser
+    
+    Args:
+        path: Path to CSV file
+        
+    Returns:
+        DataFrame with the file contents
+    """
+    try:
+        import polars as pl
+    except ImportError:
+        return _read_csv_pandas(path)
+    
+    try:
+        return pl.read_csv(path).to_pandas()
+    except ImportError:
+        # to_pandas needs pyarrow
+        return _read_csv_pandas(path)
+
+def _read_csv_pandas(path: str) -> pd.DataFrame:
+    """
+    Read a CSV file with pandas, parsing with pyarrow's multithreaded reader
+    when it is installed
+    
+    Args:
+        path: Path to CSV file
+        
+    Returns:
+        DataFrame with the file contents, using NumPy-backed dtypes
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.read_csv(path)
+    
+    return pd.read_csv(path, engine="pyarrow")
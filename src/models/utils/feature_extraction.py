@@ -1,16 +1,76 @@
 import numpy as np
-import pandas as pd
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 import mediapipe as mp
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # MediaPipe pose landmarks
 mp_pose = mp.solutions.pose
 
+# Number of landmarks in a MediaPipe pose
+NUM_LANDMARKS = 33
+
+# Landmark indices used by the geometric features, resolved once at import
+L_SHO, R_SHO = mp_pose.PoseLandmark.LEFT_SHOULDER.value, mp_pose.PoseLandmark.RIGHT_SHOULDER.value
+L_ELB, R_ELB = mp_pose.PoseLandmark.LEFT_ELBOW.value, mp_pose.PoseLandmark.RIGHT_ELBOW.value
+L_WRI, R_WRI = mp_pose.PoseLandmark.LEFT_WRIST.value, mp_pose.PoseLandmark.RIGHT_WRIST.value
+L_HIP, R_HIP = mp_pose.PoseLandmark.LEFT_HIP.value, mp_pose.PoseLandmark.RIGHT_HIP.value
+L_KNE, R_KNE = mp_pose.PoseLandmark.LEFT_KNEE.value, mp_pose.PoseLandmark.RIGHT_KNEE.value
+L_ANK, R_ANK = mp_pose.PoseLandmark.LEFT_ANKLE.value, mp_pose.PoseLandmark.RIGHT_ANKLE.value
+
+# Canonical order of the features produced by extract_pose_features
+ANGLE_FEATURE_NAMES = [
+    "right_elbow_angle", "left_elbow_angle", "right_knee_angle", "left_knee_angle", "torso_angle"
+]
+DISTANCE_FEATURE_NAMES = ["shoulder_width", "hip_width", "torso_length", "arm_length", "leg_length"]
+LANDMARK_FEATURE_NAMES = [f"landmark_{i}_{c}" for i in range(NUM_LANDMARKS) for c in ("x", "y", "z", "visibility")]
+POSE_FEATURE_NAMES = (
+    LANDMARK_FEATURE_NAMES
+    + ANGLE_FEATURE_NAMES
+    + DISTANCE_FEATURE_NAMES
+)
+
+# (first point, vertex, third point) landmark indices for each angle in
+# ANGLE_FEATURE_NAMES, in the same order
+_ANGLE_TRIPLES = np.array([
+    [R_SHO, R_ELB, R_WRI],
+    [L_SHO, L_ELB, L_WRI],
+    [R_HIP, R_KNE, R_ANK],
+    [L_HIP, L_KNE, L_ANK],
+    # Torso angle (between shoulders and hips)
+    [R_SHO, R_HIP, R_KNE]
+], dtype=np.intp)
+
+# (start, end) landmark indices of the segments behind DISTANCE_FEATURE_NAMES:
+# shoulder width, hip width, torso, right and left arm, right and left leg
+_DIST_PAIRS = np.array([
+    [L_SHO, R_SHO],
+    [L_HIP, R_HIP],
+    [R_SHO, R_HIP],
+    [R_SHO, R_WRI],
+    [L_SHO, L_WRI],
+    [R_HIP, R_ANK],
+    [L_HIP, L_ANK]
+], dtype=np.intp)
+
+def _landmark_coords(landmarks: List[Any]) -> np.ndarray:
+    """
+    Flatten landmarks into one array of x, y, z, visibility values
+    
+    Args:
+        landmarks: List of pose landmarks from MediaPipe
+        
+    Returns:
+        1D float64 array of 4 values per landmark
+    """
+    return np.fromiter(
+        (v for lm in landmarks for v in (lm.x, lm.y, lm.z, lm.visibility)),
+        dtype=np.float64,
+        count=4 * len(landmarks)
+    )
+
 def extract_pose_features(landmarks: List[Any]) -> Dict[str, float]:
     """
     Extract features from pose landmarks for model input
@@ -21,137 +81,127 @@ def extract_pose_features(landmarks: List[Any]) -> Dict[str, float]:
     Returns:
         Dictionary of landmark features
     """
+    # Validate once here; the geometric helpers below assume a full pose
+    if len(landmarks) != NUM_LANDMARKS:
+        logger.warning("Expected %d pose landmarks, got %d", NUM_LANDMARKS, len(landmarks))
+        return {}
+    
     features = {}
     
     try:
-        # Extract x, y coordinates for each landmark
-        for idx, landmark in enumerate(landmarks):
-            features[f"landmark_{idx}_x"] = landmark.x
-            features[f"landmark_{idx}_y"] = landmark.y
-            features[f"landmark_{idx}_z"] = landmark.z
-            features[f"landmark_{idx}_visibility"] = landmark.visibility
+        # Extract x, y, z, visibility for each landmark in one pass and pair
+        # them with the precomputed key names
+        coords = _landmark_coords(landmarks)
+        features.update(zip(LANDMARK_FEATURE_NAMES, coords.tolist()))
             
-        # Calculate additional geometric features
-        features.update(calculate_angles(landmarks))
-        features.update(calculate_distances(landmarks))
+        # Calculate additional geometric features from the same coordinates
+        points = coords.reshape(-1, 4)
+        features.update(zip(ANGLE_FEATURE_NAMES, _angles_from_points(points).tolist()))
+        features.update(zip(DISTANCE_FEATURE_NAMES, _distances_from_points(points).tolist()))
             
         return features
     except Exception as e:
         logger.error(f"Error extracting pose features: {e}")
         return {}
 
-def calculate_angles(landmarks: List[Any]) -> Dict[str, float]:
+def extract_pose_feature_array(landmarks: List[Any]) -> np.ndarray:
     """
-    Calculate joint angles from landmarks
+    Extract features from pose landmarks as an array in POSE_FEATURE_NAMES order
     
     Args:
-        landmarks: List of pose landmarks
+        landmarks: List of 33 pose landmarks from MediaPipe
         
     Returns:
-        Dictionary of angle features
+        1D array of features (zeros for features that could not be computed)
     """
-    angles = {}
+    features = np.zeros(len(POSE_FEATURE_NAMES))
+    
+    # Validate once here; the geometric helpers below assume a full pose
+    if len(landmarks) != NUM_LANDMARKS:
+        logger.warning("Expected %d pose landmarks, got %d", NUM_LANDMARKS, len(landmarks))
+        return features
     
     try:
-        # Right elbow angle
-        angles["right_elbow_angle"] = calculate_angle(
-            landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value],
-            landmarks[mp_pose.PoseLandmark.RIGHT_ELBOW.value],
-            landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value]
-        )
-        
-        # Left elbow angle
-        angles["left_elbow_angle"] = calculate_angle(
-            landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value],
-            landmarks[mp_pose.PoseLandmark.LEFT_ELBOW.value],
-            landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value]
-        )
+        # Landmark coordinates fill the leading 132 slots
+        n_coords = len(LANDMARK_FEATURE_NAMES)
+        features[:n_coords] = _landmark_coords(landmarks)
         
-        # Right knee angle
-        angles["right_knee_angle"] = calculate_angle(
-            landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value],
-            landmarks[mp_pose.PoseLandmark.RIGHT_KNEE.value],
-            landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value]
-        )
-        
-        # Left knee angle
-        angles["left_knee_angle"] = calculate_angle(
-            landmarks[mp_pose.PoseLandmark.LEFT_HIP.value],
-            landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value],
-            landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-        )
+        # Geometric features follow in their canonical order
+        points = features[:n_coords].reshape(-1, 4)
+        n_angles = len(ANGLE_FEATURE_NAMES)
+        features[n_coords:n_coords + n_angles] = _angles_from_points(points)
+        features[n_coords + n_angles:] = _distances_from_points(points)
+    except Exception as e:
+        logger.error(f"Error extracting pose features: {e}")
+    
+    return features
+
+def calculate_angles(landmarks: List[Any]) -> Dict[str, float]:
+    """
+    Calculate joint angles from landmarks
+    
+    Args:
+        landmarks: List of 33 pose landmarks; raises on a partial pose
         
-        # Torso angle (between shoulders and hips)
-        angles["torso_angle"] = calculate_angle(
-            landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value],
-            landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value],
-            landmarks[mp_pose.PoseLandmark.RIGHT_KNEE.value]
-        )
+    Returns:
+        Dictionary of angle features
+    """
+    angles = _angles_from_points(np.array([[lm.x, lm.y] for lm in landmarks]))
+    return dict(zip(ANGLE_FEATURE_NAMES, angles.tolist()))
+
+def _angles_from_points(points: np.ndarray) -> np.ndarray:
+    """
+    Calculate every joint angle in one vectorized pass
+    
+    Args:
+        points: (33, k) array of landmark coordinates with x, y first
         
-        return angles
-    except Exception as e:
-        logger.error(f"Error calculating joint angles: {e}")
-        return {}
+    Returns:
+        Array of angles in degrees in ANGLE_FEATURE_NAMES order
+    """
+    pts = points[:, :2]
+    v1 = pts[_ANGLE_TRIPLES[:, 0]] - pts[_ANGLE_TRIPLES[:, 1]]
+    v2 = pts[_ANGLE_TRIPLES[:, 2]] - pts[_ANGLE_TRIPLES[:, 1]]
+    
+    # Zero-length segments give NaN, as calculate_angle does
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cos_angles = (v1 * v2).sum(axis=1) / (np.linalg.norm(v1, axis=1) * np.linalg.norm(v2, axis=1))
+    return np.degrees(np.arccos(np.clip(cos_angles, -1.0, 1.0)))
 
 def calculate_distances(landmarks: List[Any]) -> Dict[str, float]:
     """
     Calculate distances between key landmarks
     
     Args:
-        landmarks: List of pose landmarks
+        landmarks: List of 33 pose landmarks; raises on a partial pose
         
     Returns:
         Dictionary of distance features
     """
-    distances = {}
+    distances = _distances_from_points(np.array([[lm.x, lm.y, lm.z] for lm in landmarks]))
+    return dict(zip(DISTANCE_FEATURE_NAMES, distances.tolist()))
+
+def _distances_from_points(points: np.ndarray) -> np.ndarray:
+    """
+    Calculate every landmark distance in one vectorized pass
     
-    try:
-        # Shoulder width
-        distances["shoulder_width"] = calculate_distance(
-            landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value],
-            landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-        )
-        
-        # Hip width
-        distances["hip_width"] = calculate_distance(
-            landmarks[mp_pose.PoseLandmark.LEFT_HIP.value],
-            landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value]
-        )
-        
-        # Shoulder to hip (torso length)
-        distances["torso_length"] = calculate_distance(
-            landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value],
-            landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value]
-        )
-        
-        # Wrist to shoulder (arm length)
-        distances["arm_length"] = (
-            calculate_distance(
-                landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value],
-                landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value]
-            ) +
-            calculate_distance(
-                landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value],
-                landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value]
-            )
-        ) / 2
-        
-        # Hip to ankle (leg length)
-        distances["leg_length"] = (
-            calculate_distance(
-                landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value],
-                landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value]
-            ) +
-            calculate_distance(
-                landmarks[mp_pose.PoseLandmark.LEFT_HIP.value],
-                landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-            )
-        ) / 2
+    Args:
+        points: (33, k) array of landmark coordinates with x, y, z first
         
-        return distances
-    except Exception as e:
-        logger.error(f"Error calculating landmark distances: {e}")
-        return {}
+    Returns:
+        Array of distances in DISTANCE_FEATURE_NAMES order
+    """
+    pts = points[:, :3]
+    segments = np.linalg.norm(pts[_DIST_PAIRS[:, 0]] - pts[_DIST_PAIRS[:, 1]], axis=1)
+    
+    # Arm and leg lengths average the right and left sides
+    return np.array([
+        segments[0],
+        segments[1],
+        segments[2],
+        (segments[3] + segments[4]) / 2,
+        (segments[5] + segments[6]) / 2
+    ])
 
 def calculate_angle(p1: Any, p2: Any, p3: Any) -> float:
     """
@@ -198,14 +248,20 @@ def calculate_distance(p1: Any, p2: Any) -> float:
         (p1.z - p2.z) ** 2
     )
 
-def features_to_dataframe(features: Dict[str, float]) -> pd.DataFrame:
+def features_to_array(features: Dict[str, float], feature_names: Sequence[str]) -> np.ndarray:
     """
-    Convert feature dictionary to DataFrame
+    Convert feature dictionary to a single-row model input
     
     Args:
         features: Dictionary of extracted features
+        feature_names: Model feature names in column order (a tuple iterates
+            fastest)
         
     Returns:
-        DataFrame containing features
+        (1, len(feature_names)) float32 array, 0 for missing features
     """
-    return pd.DataFrame([features]) 
\ No newline at end of file
+    return np.fromiter(
+        (features.get(name, 0.0) for name in feature_names),
+        dtype=np.float32,
+        count=len(feature_names)
+    ).reshape(1, -1)
@@ -1,19 +1,78 @@
+import copy
 import os
+import json
+import shutil
 import joblib
 import logging
+import threading
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any, Optional, Dict, List, Tuple
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def save_model(model: Any, model_path: str) -> bool:
+# Forest pickles are dominated by the per-tree node arrays (feature,
+# threshold, value), which are highly repetitive and compress well. LZ4
+# decompresses faster than the disk can read the raw arrays; zlib is the
+# fallback when the optional lz4 package is not installed.
+try:
+    import lz4.frame  # noqa: F401
+    DEFAULT_COMPRESS: Tuple[str, int] = ("lz4", 3)
+except ImportError:
+    DEFAULT_COMPRESS = ("zlib", 3)
+
+# Model pickles are written with pickle protocol 5
+PICKLE_PROTOCOL = 5
+
+def _fsync(path: str) -> None:
+    """
+    Flush a written file to disk
+    
+    Args:
+        path: Path of the file
+    """
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def dump_compressed(obj: Any, path: str, compress: Any = DEFAULT_COMPRESS) -> None:
+    """
+    Write an object with joblib using compression and pickle protocol 5
+    
+    The file is written to a temporary path, flushed to disk and renamed
+    over the destination, so a crash mid-write never leaves a truncated file.
+    
+    Args:
+        obj: Object to save
+        path: Destination path
+        compress: joblib compression setting (method, level); loading
+            detects it automatically
+    """
+    tmp_path = path + ".tmp"
+    try:
+        joblib.dump(obj, tmp_path, compress=compress, protocol=PICKLE_PROTOCOL)
+        
+        # Make sure the data is on disk before the rename makes it visible
+        _fsync(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def save_model(model: Any, model_path: str, compress: Any = DEFAULT_COMPRESS) -> bool:
     """
     Save a model to disk
     
     Args:
         model: Model object to save
         model_path: Path to save the model
+        compress: joblib compression setting (method, level); loading
+            detects it automatically
         
     Returns:
         True if successful, False otherwise
@@ -23,19 +82,79 @@ def save_model(model: Any, model_path: str) -> bool:
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
         
         # Save the model
-        joblib.dump(model, model_path)
+        dump_compressed(model, model_path, compress)
         logger.info(f"Model saved to {model_path}")
         return True
     except Exception as e:
         logger.error(f"Error saving model: {e}")
         return False
 
+# Per-file locks so concurrent callers deserialize a file only once, while
+# different files can still load in parallel
+_path_locks: Dict[str, threading.Lock] = {}
+_path_locks_guard = threading.Lock()
+
+@lru_cache(maxsize=32)
+def _load_cached(path: str, mtime: float) -> Any:
+    """
+    Deserialize a joblib file, memoized per process
+    
+    Args:
+        path: Path to the joblib file
+        mtime: Modification time of the file, so a rewritten file is reloaded
+        
+    Returns:
+        Deserialized object, shared by all callers
+    """
+    return joblib.load(path)
+
+def load_cached(path: str) -> Any:
+    """
+    Load a joblib file once per process and modification time
+    
+    Callers share the returned object, so shallow-copy it before changing
+    its attributes.
+    
+    Args:
+        path: Path to the joblib file
+        
+    Returns:
+        Deserialized object
+    """
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    with _path_locks_guard:
+        lock = _path_locks.setdefault(path, threading.Lock())
+    with lock:
+        return _load_cached(path, mtime)
+
+def single_threaded(model: Any) -> Any:
+    """
+    Get a model that predicts on a single thread
+    
+    Forests are trained with n_jobs=-1, but inference is mostly one row
+    per frame, where dispatching trees to a thread pool costs more than
+    walking them serially.
+    
+    Args:
+        model: Fitted model, possibly shared through load_cached
+        
+    Returns:
+        The model, or a shallow copy with n_jobs=1 so a shared cached model
+        is left untouched
+    """
+    if getattr(model, "n_jobs", None) not in (None, 1):
+        model = copy.copy(model)
+        model.n_jobs = 1
+    return model
+
 def load_model(model_path: str) -> Optional[Any]:
     """
     Load a model from disk
     
     Args:
-        model_path: Path to the model file
+        model_path: Path to the model file; a .onnx file is loaded into an
+            ONNX Runtime session wrapped in OnnxModel
         
     Returns:
         Loaded model or None if error
@@ -44,21 +163,41 @@ def load_model(model_path: str) -> Optional[Any]:
         if not os.path.exists(model_path):
             logger.warning(f"Model file not found at {model_path}")
             return None
+        
+        if model_path.endswith(".onnx"):
+            return load_onnx_model(model_path)
             
-        model = joblib.load(model_path)
+        model = single_threaded(load_cached(model_path))
+        
         logger.info(f"Model loaded from {model_path}")
         return model
     except Exception as e:
         logger.error(f"Error loading model: {e}")
         return None
 
-def save_feature_names(feature_names: List[str], path: str) -> bool:
+# Shared worker threads for loading models in the background
+_background_loader = ThreadPoolExecutor(max_workers=4, thread_name_prefix="model-loader")
+
+def load_model_async(model_path: str) -> Future:
+    """
+    Start loading a model from disk in the background
+    
+    Args:
+        model_path: Path to the model file
+        
+    Returns:
+        Future resolving to the loaded model or None if error
+    """
+    return _background_loader.submit(load_model, model_path)
+
+def save_feature_names(feature_names: List[str], path: str, compress: Any = DEFAULT_COMPRESS) -> bool:
     """
     Save feature names to disk
     
     Args:
         feature_names: List of feature names
         path: Path to save the feature names
+        compress: joblib compression setting (method, level)
         
     Returns:
         True if successful, False otherwise
@@ -68,7 +207,7 @@ def save_feature_names(feature_names: List[str], path: str) -> bool:
         os.makedirs(os.path.dirname(path), exist_ok=True)
         
         # Save the feature names
-        joblib.dump(feature_names, path)
+        dump_compressed(feature_names, path, compress)
         logger.info(f"Feature names saved to {path}")
         return True
     except Exception as e:
@@ -90,9 +229,350 @@ def load_feature_names(path: str) -> Optional[List[str]]:
             logger.warning(f"Feature names file not found at {path}")
             return None
             
-        feature_names = joblib.load(path)
+        feature_names = list(load_cached(path))
         logger.info(f"Feature names loaded from {path}")
         return feature_names
     except Exception as e:
         logger.error(f"Error loading feature names: {e}")
-        return None 
\ No newline at end of file
+        return None 
+
+def load_feature_names_async(path: str) -> Future:
+    """
+    Start loading feature names from disk in the background
+    
+    Args:
+        path: Path to the feature names file
+        
+    Returns:
+        Future resolving to the list of feature names or None if error
+    """
+    return _background_loader.submit(load_feature_names, path)
+
+class OnnxModel:
+    """
+    Classifier backed by an ONNX Runtime session, exposing the subset of the
+    scikit-learn API used for inference (predict, predict_proba, classes_)
+    """
+    def __init__(self, session: Any, classes: List[Any]):
+        """
+        Initialize the ONNX model wrapper
+        
+        Args:
+            session: onnxruntime InferenceSession
+            classes: Class labels in probability column order
+        """
+        self.session = session
+        self.classes_ = np.asarray(classes)
+        self.n_features_in_ = session.get_inputs()[0].shape[1]
+        self._input_name = session.get_inputs()[0].name
+        
+        # With zipmap disabled the converter emits (label, probabilities)
+        self._proba_output = session.get_outputs()[1].name
+    
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        Predict class probabilities
+        
+        Args:
+            X: 2D array-like of features
+            
+        Returns:
+            Array of shape (n_samples, n_classes)
+        """
+        inputs = {self._input_name: np.asarray(X, dtype=np.float32)}
+        return self.session.run([self._proba_output], inputs)[0]
+    
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Predict class labels
+        
+        Args:
+            X: 2D array-like of features
+            
+        Returns:
+            Array of predicted labels
+        """
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+def save_onnx_model(model: Any, n_features: int, model_path: str) -> bool:
+    """
+    Export a fitted scikit-learn classifier to ONNX (requires skl2onnx)
+    
+    Like dump_compressed, the file is written to a temporary path and renamed
+    over the destination once it is on disk.
+    
+    Args:
+        model: Fitted classifier
+        n_features: Number of input features
+        model_path: Path to save the .onnx file
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+    except ImportError:
+        logger.info("skl2onnx not installed, skipping ONNX export")
+        return False
+    
+    tmp_path = model_path + ".tmp"
+    try:
+        # Create directory if it doesn't exist
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        
+        # Convert with plain probability tensors instead of a list of dicts
+        onnx_model = convert_sklearn(
+            model,
+            initial_types=[("X", FloatTensorType([None, n_features]))],
+            options={id(model): {"zipmap": False}}
+        )
+        
+        # Keep the class labels with the model for predict()
+        meta = onnx_model.metadata_props.add()
+        meta.key = "classes"
+        meta.value = json.dumps(np.asarray(model.classes_).tolist())
+        
+        with open(tmp_path, "wb") as f:
+            f.write(onnx_model.SerializeToString())
+        _fsync(tmp_path)
+        os.replace(tmp_path, model_path)
+        logger.info(f"ONNX model saved to {model_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Error exporting ONNX model: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+def export_is_current(export_path: str, model_path: str) -> bool:
+    """
+    Check whether an export was written no earlier than its pickle
+    
+    A pickle replaced after its export was written (e.g. by run.py copying
+    a retrained model) must win over the outdated export.
+    
+    Args:
+        export_path: Path to the export file or packed forest directory
+        model_path: Path to the pickled model
+        
+    Returns:
+        True if the export exists and is not older than the pickle (or
+        there is no pickle), False otherwise
+    """
+    try:
+        if os.path.isdir(export_path):
+            # Check the files: the oldest array must not predate the pickle
+            export_mtime = min(entry.stat().st_mtime for entry in os.scandir(export_path))
+        else:
+            export_mtime = os.path.getmtime(export_path)
+    except (OSError, ValueError):
+        # Missing or empty export
+        return False
+    
+    if not os.path.exists(model_path):
+        return True
+    return export_mtime >= os.path.getmtime(model_path)
+
+def load_onnx_model(model_path: str) -> Optional[OnnxModel]:
+    """
+    Load an ONNX classifier for inference (requires onnxruntime)
+    
+    Args:
+        model_path: Path to the .onnx file
+        
+    Returns:
+        OnnxModel or None if unavailable or error
+    """
+    if not os.path.exists(model_path):
+        return None
+    
+    try:
+        import onnxruntime
+    except ImportError:
+        logger.info("onnxruntime not installed, skipping ONNX model")
+        return None
+    
+    try:
+        session = onnxruntime.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        classes = json.loads(session.get_modelmeta().custom_metadata_map["classes"])
+        logger.info(f"ONNX model loaded from {model_path}")
+        return OnnxModel(session, classes)
+    except Exception as e:
+        logger.error(f"Error loading ONNX model: {e}")
+        return None
+
+# Arrays making up a packed forest, one .npy file each
+_PACKED_FOREST_ARRAYS = ("feature", "left", "right", "threshold", "value", "classes")
+
+class PackedForest:
+    """
+    Tree-ensemble classifier stored as flat NumPy arrays, which load with
+    mmap instead of unpickling every tree. Exposes predict, predict_proba
+    and classes_ like the scikit-learn model it was packed from.
+    """
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Initialize the packed forest
+        
+        Args:
+            arrays: Mapping of array name to array (see _PACKED_FOREST_ARRAYS)
+        """
+        self.feature = arrays["feature"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.classes_ = arrays["classes"]
+        self._trees = np.arange(self.feature.shape[0])
+    
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        Predict class probabilities by walking all trees for all samples at once
+        
+        Args:
+            X: 2D array-like of features
+            
+        Returns:
+            Array of shape (n_samples, n_classes)
+        """
+        X = np.asarray(X, dtype=np.float32)
+        node = np.zeros((X.shape[0], len(self._trees)), dtype=np.intp)
+        
+        # Advance every (sample, tree) pair one level per step until all reach leaves
+        while True:
+            feature = self.feature[self._trees, node]
+            is_leaf = feature < 0
+            if is_leaf.all():
+                break
+            
+            x = np.take_along_axis(X, np.where(is_leaf, 0, feature), axis=1)
+            go_left = x <= self.threshold[self._trees, node]
+            child = np.where(go_left, self.left[self._trees, node], self.right[self._trees, node])
+            node = np.where(is_leaf, node, child)
+        
+        # Average the per-tree leaf class distributions
+        return self.value[self._trees, node].mean(axis=1)
+    
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Predict class labels
+        
+        Args:
+            X: 2D array-like of features
+            
+        Returns:
+            Array of predicted labels
+        """
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+def save_packed_forest(model: Any, forest_dir: str) -> bool:
+    """
+    Pack a fitted single-output scikit-learn forest classifier into .npy arrays
+    
+    The arrays are written to a temporary directory that replaces forest_dir
+    once they are on disk, so a crash never leaves a partly written forest.
+    
+    Args:
+        model: Fitted forest classifier (e.g. RandomForestClassifier)
+        forest_dir: Directory to write the arrays to
+        
+    Returns:
+        True if successful, False if the model cannot be packed or on error
+    """
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None or getattr(model, "n_outputs_", 1) != 1:
+        return False
+    
+    tmp_dir = forest_dir + ".tmp"
+    old_dir = forest_dir + ".old"
+    try:
+        trees = [estimator.tree_ for estimator in estimators]
+        n_trees = len(trees)
+        max_nodes = max(tree.node_count for tree in trees)
+        n_classes = len(model.classes_)
+        
+        # Padding nodes are marked as leaves (negative feature)
+        feature = np.full((n_trees, max_nodes), -2, dtype=np.int32)
+        left = np.full((n_trees, max_nodes), -1, dtype=np.int32)
+        right = np.full((n_trees, max_nodes), -1, dtype=np.int32)
+        # Thresholds stay float64: rounding them could flip split decisions
+        threshold = np.zeros((n_trees, max_nodes), dtype=np.float64)
+        value = np.zeros((n_trees, max_nodes, n_classes), dtype=np.float32)
+        
+        for i, tree in enumerate(trees):
+            n = tree.node_count
+            feature[i, :n] = tree.feature
+            left[i, :n] = tree.children_left
+            right[i, :n] = tree.children_right
+            threshold[i, :n] = tree.threshold
+            
+            # Normalize leaf counts/weights to class probabilities per tree
+            counts = tree.value[:, 0, :]
+            totals = counts.sum(axis=1, keepdims=True)
+            value[i, :n] = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+        
+        # String labels come out of pandas as objects; store them as unicode
+        classes = np.asarray(model.classes_)
+        if classes.dtype == object:
+            classes = classes.astype(str)
+        
+        arrays = {
+            "feature": feature,
+            "left": left,
+            "right": right,
+            "threshold": threshold,
+            "value": value,
+            "classes": classes
+        }
+        
+        # Start from an empty directory, dropping leftovers of a failed save
+        for path in (tmp_dir, old_dir):
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+        os.makedirs(tmp_dir)
+        for name in _PACKED_FOREST_ARRAYS:
+            array_path = os.path.join(tmp_dir, f"{name}.npy")
+            np.save(array_path, arrays[name], allow_pickle=False)
+            _fsync(array_path)
+        
+        # A directory cannot be renamed over a non-empty one, so move the old
+        # forest aside first; until the second rename there is no forest and
+        # the pickle is loaded instead
+        if os.path.isdir(forest_dir):
+            os.rename(forest_dir, old_dir)
+        os.rename(tmp_dir, forest_dir)
+        if os.path.isdir(old_dir):
+            shutil.rmtree(old_dir)
+        
+        logger.info(f"Packed forest saved to {forest_dir}")
+        return True
+    except Exception as e:
+        logger.error(f"Error saving packed forest: {e}")
+        if os.path.isdir(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        return False
+
+def load_packed_forest(forest_dir: str) -> Optional[PackedForest]:
+    """
+    Load a packed forest, memory-mapping its arrays
+    
+    Args:
+        forest_dir: Directory written by save_packed_forest
+        
+    Returns:
+        PackedForest or None if not found or error
+    """
+    if not os.path.isdir(forest_dir):
+        return None
+    
+    try:
+        arrays = {
+            name: np.load(os.path.join(forest_dir, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+            for name in _PACKED_FOREST_ARRAYS
+        }
+        logger.info(f"Packed forest loaded from {forest_dir}")
+        return PackedForest(arrays)
+    except Exception as e:
+        logger.error(f"Error loading packed forest: {e}")
+        return None
@@ -0,0 +1,43 @@
+import logging
+from types import MappingProxyType
+from typing import List, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Recommended exercises per body type and fitness level, built once at import
+RECOMMENDATIONS: Mapping[str, Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+    "Inverted Triangle": MappingProxyType({
+        "Beginner": ("Squats", "Lunges", "Glute Bridges", "Calf Raises"),
+        "Intermediate": ("Deadlifts", "Romanian Deadlifts", "Hip Thrusts", "Step-Ups"),
+        "Advanced": ("Bulgarian Split Squats", "Pistol Squats", "Box Jumps", "Trap Bar Deadlifts")
+    }),
+    "Pear": MappingProxyType({
+        "Beginner": ("Push-Ups", "Dumbbell Rows", "Shoulder Press", "Bicep Curls"),
+        "Intermediate": ("Bench Press", "Pull-Ups", "Lateral Raises", "Tricep Dips"),
+        "Advanced": ("Weighted Pull-Ups", "Incline Bench Press", "Military Press", "Cable Flyes")
+    }),
+    "Rectangle": MappingProxyType({
+        "Beginner": ("Burpees", "Mountain Climbers", "Jumping Jacks", "High Knees"),
+        "Intermediate": ("Box Jumps", "Kettlebell Swings", "Plank Variations", "Medicine Ball Slams"),
+        "Advanced": ("Plyometric Push-Ups", "Tuck Jumps", "Battle Ropes", "Barbell Complexes")
+    })
+})
+
+DEFAULT_RECOMMENDATIONS: Tuple[str, ...] = ("Push-Ups", "Squats", "Planks", "Lunges", "Mountain Climbers")
+
+def get_recommendations(body_type: str, fitness_level: str = "Intermediate") -> List[str]:
+    """
+    Look up exercise recommendations for a body type and fitness level
+    
+    Args:
+        body_type: Body type classification
+        fitness_level: Fitness level (Beginner, Intermediate, Advanced)
+        
+    Returns:
+        List of recommended exercises, the defaults if there is no specific entry
+    """
+    exercises = RECOMMENDATIONS.get(body_type, {}).get(fitness_level)
+    if exercises is None:
+        logger.warning(f"No specific recommendations for {body_type} at {fitness_level} level")
+        exercises = DEFAULT_RECOMMENDATIONS
+    return list(exercises)
@@ -0,0 +1,28 @@
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+_patched = False
+
+def patch_sklearn_if_available() -> bool:
+    """
+    Use the oneDAL-accelerated scikit-learn estimators when
+    scikit-learn-intelex is installed
+    
+    Must run before the estimators are imported from sklearn; repeated calls
+    do nothing.
+    
+    Returns:
+        True if scikit-learn is patched, False if sklearnex is not installed
+    """
+    global _patched
+    if not _patched:
+        try:
+            from sklearnex import patch_sklearn
+        except ImportError:
+            return False
+        patch_sklearn()
+        _patched = True
+        logger.info("scikit-learn patched with scikit-learn-intelex")
+    return True
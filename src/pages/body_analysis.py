@@ -1,12 +1,10 @@
 import streamlit as st
 import cv2
 import numpy as np
-import pandas as pd
 import os
 import sys
 import time
 import logging
-from PIL import Image
 
 # Add the parent directory to the path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -14,17 +12,84 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 # Import utility functions
 from src.utils.config_utils import get_app_config, get_mediapipe_config
 from src.utils.ui_utils import (
-    set_page_config, apply_custom_css, display_header, 
+    set_page_config, apply_custom_css, display_header, display_navigation,
     show_info_box, show_success_box, show_warning_box,
     create_card, display_metric
 )
-from src.core.pose_estimation import PoseEstimator
-from src.models.model_manager import ModelManager
+from src.utils.cache_utils import get_pose_estimator, get_model_manager
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Uploaded photos are downscaled so their longest side is at most this many
+# pixels before analysis; landmarks are normalized, so measurements are unaffected
+ANALYSIS_MAX_DIM = 640
+
+# Descriptions shown for each body type
+BODY_TYPE_DESCRIPTIONS = {
+    "Inverted Triangle": """
+    **Characteristics**:
+    - Wider shoulders compared to hips
+    - Athletic upper body
+    - Narrower hips and waist
+    
+    **Clothing Tips**:
+    - Emphasize lower body with brighter colors or patterns
+    - Choose tops that don't add volume to shoulders
+    - A-line or flared bottoms balance your silhouette
+    
+    **Training Focus**:
+    - Lower body exercises to build proportion
+    - Moderate upper body maintenance
+    - Core strengthening
+    """,
+    
+    "Rectangle": """
+    **Characteristics**:
+    - Similar measurements at shoulders and hips
+    - Balanced proportions
+    - Less defined waist
+    
+    **Clothing Tips**:
+    - Create curves with waist-defining garments
+    - Layer to add dimension
+    - Belt at waist to create definition
+    
+    **Training Focus**:
+    - Full-body workouts with emphasis on core
+    - Exercises that create a more defined waist
+    - Balanced upper and lower body training
+    """,
+    
+    "Pear": """
+    **Characteristics**:
+    - Narrower shoulders compared to hips
+    - Wider hips, thighs, and buttocks
+    - Defined waist
+    
+    **Clothing Tips**:
+    - Draw attention to upper body with details and brighter colors
+    - A-line or straight-leg bottoms
+    - Avoid bottoms with excessive details in hip area
+    
+    **Training Focus**:
+    - Upper body strengthening to build proportion
+    - Core and back exercises for better posture
+    - Lower body toning without excessive bulking
+    """
+}
+
+# Measurement keys and row labels of the body measurements table, in display order
+MEASUREMENT_KEYS = ("shoulder_width", "hip_width", "shoulder_hip_ratio", "leg_length", "arm_length")
+MEASUREMENT_LABELS = (
+    "Shoulder Width",
+    "Hip Width",
+    "Shoulder-to-Hip Ratio",
+    "Leg Length",
+    "Arm Length"
+)
+
 def main():
     """
     Main function for the body analysis page
@@ -52,33 +117,16 @@ def main():
         )
         
         # Sidebar navigation
-        st.sidebar.title("Navigation")
-        
-        if st.sidebar.button("🏠 Home"):
-            st.switch_page("app.py")
-            
-        if st.sidebar.button("🏋️ Exercise Verification"):
-            st.switch_page("pages/exercise_verification.py")
-            
-        if st.sidebar.button("📋 Exercise Recommendations"):
-            st.switch_page("pages/exercise_recommendations.py")
-            
-        if st.sidebar.button("📈 Progress Tracking"):
-            st.switch_page("pages/progress_tracking.py")
+        display_navigation("pages/body_analysis.py")
         
-        if st.sidebar.button("🧮 Health Measurements"):
-            st.switch_page("pages/measurements.py")
-        
-        # Initialize pose estimator
-        pose_estimator = PoseEstimator(
+        # Get the shared pose estimator and model manager (created once, not on every rerun)
+        pose_estimator = get_pose_estimator(
             static_image_mode=True,  # Use static image mode for analysis
             model_complexity=mediapipe_config.get("model_complexity", 1),
             min_detection_confidence=mediapipe_config.get("min_detection_confidence", 0.5),
             min_tracking_confidence=mediapipe_config.get("min_tracking_confidence", 0.5)
         )
-        
-        # Initialize model manager
-        model_manager = ModelManager()
+        model_manager = get_model_manager()
         
         # Section for uploading image
         st.markdown("## Upload an image for body measurements")
@@ -98,9 +146,8 @@ def main():
         
         if uploaded_file is not None:
             with col1:
-                # Display the uploaded image
-                image = Image.open(uploaded_file)
-                st.image(image, caption="Uploaded Image", use_column_width=True)
+                # Display the uploaded image straight from its encoded bytes
+                st.image(uploaded_file.getvalue(), caption="Uploaded Image", use_column_width=True)
                 
                 # Add analyze button
                 analyze_button = st.button("Analyze Body Measurements")
@@ -109,8 +156,21 @@ def main():
                 if analyze_button:
                     with st.spinner("Analyzing body measurements..."):
                         try:
-                            # Convert PIL Image to OpenCV format
-                            image_cv = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+                            # Decode the upload straight to an OpenCV BGR image
+                            file_bytes = np.frombuffer(uploaded_file.getvalue(), np.uint8)
+                            image_cv = cv2.imdecode(file_bytes, cv2.IMREAD_COLOR)
+                            if image_cv is None:
+                                raise ValueError("Uploaded file could not be decoded as an image")
+                            
+                            # Downscale large photos before pose estimation and drawing
+                            height, width = image_cv.shape[:2]
+                            scale = ANALYSIS_MAX_DIM / max(height, width)
+                            if scale < 1:
+                                image_cv = cv2.resize(
+                                    image_cv,
+                                    (int(width * scale), int(height * scale)),
+                                    interpolation=cv2.INTER_AREA
+                                )
                             
                             # Process the image
                             annotated_image, results = pose_estimator.process_image(image_cv)
@@ -132,86 +192,18 @@ def main():
                                 # Display measurements
                                 st.markdown("## Body Measurements")
                                 
-                                # Create a DataFrame for measurements
-                                measurements_df = pd.DataFrame({
-                                    "Measurement": [
-                                        "Shoulder Width",
-                                        "Hip Width",
-                                        "Shoulder-to-Hip Ratio",
-                                        "Leg Length",
-                                        "Arm Length"
-                                    ],
-                                    "Value": [
-                                        f"{measurements.get('shoulder_width', 0):.2f}",
-                                        f"{measurements.get('hip_width', 0):.2f}",
-                                        f"{measurements.get('shoulder_hip_ratio', 0):.2f}",
-                                        f"{measurements.get('leg_length', 0):.2f}",
-                                        f"{measurements.get('arm_length', 0):.2f}"
-                                    ]
+                                # Display measurements as a table, formatted in one pass
+                                st.table({
+                                    "Measurement": MEASUREMENT_LABELS,
+                                    "Value": [f"{measurements.get(key, 0):.2f}" for key in MEASUREMENT_KEYS]
                                 })
                                 
-                                # Display measurements as a table
-                                st.table(measurements_df)
-                                
                                 # Display body type
                                 st.markdown(f"## Body Type: {body_type}")
                                 
-                                # Body type descriptions
-                                body_type_descriptions = {
-                                    "Inverted Triangle": """
-                                    **Characteristics**:
-                                    - Wider shoulders compared to hips
-                                    - Athletic upper body
-                                    - Narrower hips and waist
-                                    
-                                    **Clothing Tips**:
-                                    - Emphasize lower body with brighter colors or patterns
-                                    - Choose tops that don't add volume to shoulders
-                                    - A-line or flared bottoms balance your silhouette
-                                    
-                                    **Training Focus**:
-                                    - Lower body exercises to build proportion
-                                    - Moderate upper body maintenance
-                                    - Core strengthening
-                                    """,
-                                    
-                                    "Rectangle": """
-                                    **Characteristics**:
-                                    - Similar measurements at shoulders and hips
-                                    - Balanced proportions
-                                    - Less defined waist
-                                    
-                                    **Clothing Tips**:
-                                    - Create curves with waist-defining garments
-                                    - Layer to add dimension
-                                    - Belt at waist to create definition
-                                    
-                                    **Training Focus**:
-                                    - Full-body workouts with emphasis on core
-                                    - Exercises that create a more defined waist
-                                    - Balanced upper and lower body training
-                                    """,
-                                    
-                                    "Pear": """
-                                    **Characteristics**:
-                                    - Narrower shoulders compared to hips
-                                    - Wider hips, thighs, and buttocks
-                                    - Defined waist
-                                    
-                                    **Clothing Tips**:
-                                    - Draw attention to upper body with details and brighter colors
-                                    - A-line or straight-leg bottoms
-                                    - Avoid bottoms with excessive details in hip area
-                                    
-                                    **Training Focus**:
-                                    - Upper body strengthening to build proportion
-                                    - Core and back exercises for better posture
-                                    - Lower body toning without excessive bulking
-                                    """
-                                }
                                 
                                 # Display body type description
-                                st.markdown(body_type_descriptions.get(body_type, ""))
+                                st.markdown(BODY_TYPE_DESCRIPTIONS.get(body_type, ""))
                                 
                                 # Get exercise recommendations
                                 recommendations = model_manager.get_exercise_recommendations(
@@ -1,9 +1,9 @@
 import streamlit as st
-import cv2
+import streamlit.components.v1 as components
 import numpy as np
 import os
 import sys
-import time
+import uuid
 import logging
 
 # Add the parent directory to the path to import modules
@@ -12,17 +12,120 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 # Import utility functions
 from src.utils.config_utils import get_app_config, get_mediapipe_config
 from src.utils.ui_utils import (
-    set_page_config, apply_custom_css, display_header, 
+    set_page_config, apply_custom_css, display_header, display_navigation,
     show_info_box, show_success_box, show_warning_box, 
     display_feedback
 )
 from src.core.pose_estimation import PoseEstimator
-from src.models.model_manager import ModelManager
+from src.core.live_verification import LiveVerification
+from src.utils.cache_utils import (
+    get_session_pose_estimator, acquire_webcam, track_webcam_verification,
+    release_webcam, get_model_manager
+)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Seconds between refreshes of the form feedback panel (5 Hz, plenty for
+# reading); it refreshes independently of the video, which streams separately
+FEEDBACK_INTERVAL = 0.2
+
+# Height in pixels of the live video frame on the page
+VIDEO_HEIGHT = 480
+
+def _start_verification(pose_estimator: PoseEstimator, exercise_type: str) -> None:
+    """
+    Start verification on the shared webcam (Start button callback)
+    
+    Args:
+        pose_estimator: Pose estimator for this session
+        exercise_type: Exercise being verified
+    """
+    # Only one verification per session
+    _stop_verification()
+    
+    # Only one session at a time can read from the webcam
+    owner = st.session_state.setdefault("webcam_owner", uuid.uuid4().hex)
+    cap = acquire_webcam(owner)
+    if cap is None:
+        st.session_state.webcam_busy = True
+        return
+    
+    verification = LiveVerification(pose_estimator, exercise_type, cap)
+    if not verification.start():
+        release_webcam(owner)
+        if verification.stream_failed:
+            st.session_state.stream_error = True
+        else:
+            st.session_state.webcam_error = True
+        return
+    
+    track_webcam_verification(owner, verification)
+    st.session_state.verification = verification
+    st.session_state.verification_done = False
+    st.session_state.can_save = False
+
+def _stop_verification() -> None:
+    """
+    Stop verification, keeping the webcam open (Stop button callback)
+    """
+    verification = st.session_state.pop("verification", None)
+    if verification is not None:
+        verification.stop()
+        release_webcam(st.session_state.webcam_owner)
+        st.session_state.last_feedback = verification.feedback
+        st.session_state.verification_done = True
+        st.session_state.can_save = True
+
+def _save_results() -> None:
+    """
+    Save the verification results (Save Results button callback)
+    """
+    # Here you would save the results to a database or file
+    st.session_state.results_saved = True
+    
+    # Disable the save button after saving
+    st.session_state.can_save = False
+
+@st.fragment(run_every=FEEDBACK_INTERVAL)
+def feedback_panel(verification: LiveVerification) -> None:
+    """
+    Show the latest form feedback and metrics of a running verification
+    
+    Args:
+        verification: Running verification session
+    """
+    # Keep the session alive while its page is open
+    verification.heartbeat()
+    
+    if not verification.running:
+        # The webcam stopped delivering frames
+        if verification.failed:
+            st.session_state.webcam_error = True
+        _stop_verification()
+        st.rerun()
+    
+    form_analysis = verification.feedback
+    
+    # Display feedback
+    st.markdown("### Form Feedback")
+    if form_analysis["feedback"]:
+        display_feedback(form_analysis["feedback"], form_analysis["correct"])
+    
+    # Display metrics
+    st.markdown("### Metrics")
+    metrics = form_analysis.get("metrics", {})
+    for metric, value in metrics.items():
+        label = PoseEstimator.METRIC_LABELS.get(metric, metric)
+        if isinstance(value, bool):
+            status = "✅" if value else "❌"
+            st.markdown(f"**{label}**: {status}")
+        elif isinstance(value, (int, float)):
+            st.markdown(f"**{label}**: {value:.1f}°")
+        else:
+            st.markdown(f"**{label}**: {value}")
+
 def main():
     """
     Main function for the exercise verification page
@@ -50,22 +153,7 @@ def main():
         )
         
         # Sidebar navigation
-        st.sidebar.title("Navigation")
-        
-        if st.sidebar.button("🏠 Home"):
-            st.switch_page("app.py")
-            
-        if st.sidebar.button("📏 Body Analysis"):
-            st.switch_page("pages/body_analysis.py")
-            
-        if st.sidebar.button("📋 Exercise Recommendations"):
-            st.switch_page("pages/exercise_recommendations.py")
-            
-        if st.sidebar.button("📈 Progress Tracking"):
-            st.switch_page("pages/progress_tracking.py")
-        
-        if st.sidebar.button("🧮 Health Measurements"):
-            st.switch_page("pages/measurements.py")
+        display_navigation("pages/exercise_verification.py")
         
         # Exercise selection
         st.sidebar.title("Exercise Settings")
@@ -74,6 +162,9 @@ def main():
             ["Push-up", "Squat", "Plank", "Lunge"]
         )
         
+        # The lite pose model is 2-3x faster, at a small cost in accuracy
+        performance_mode = st.sidebar.checkbox("Performance mode (faster, less accurate)", value=True)
+        
         # Exercise descriptions
         exercise_descriptions = {
             "Push-up": """
@@ -127,129 +218,86 @@ def main():
         st.markdown(f"## {exercise_type}")
         st.markdown(exercise_descriptions[exercise_type])
         
-        # Initialize pose estimator
-        pose_estimator = PoseEstimator(
+        # Get the pose estimator for this session (created once, not on every
+        # rerun; toggling performance mode rebuilds it once)
+        pose_estimator = get_session_pose_estimator(
             static_image_mode=mediapipe_config.get("static_image_mode", False),
-            model_complexity=mediapipe_config.get("model_complexity", 1),
+            model_complexity=0 if performance_mode else mediapipe_config.get("model_complexity", 1),
             min_detection_confidence=mediapipe_config.get("min_detection_confidence", 0.5),
             min_tracking_confidence=mediapipe_config.get("min_tracking_confidence", 0.5)
         )
         
         # Initialize model manager
-        model_manager = ModelManager()
+        model_manager = get_model_manager()
         
-        # Webcam preview placeholder
-        preview_col, feedback_col = st.columns([3, 1])
-        with preview_col:
-            video_placeholder = st.empty()
+        # Verification view, filled in once the buttons have been handled
+        view = st.container()
         
-        # Feedback placeholder
-        with feedback_col:
-            feedback_placeholder = st.empty()
-            feedback_placeholder.markdown("""
-            ### Form Feedback
-            Start the verification to get real-time feedback on your exercise form.
-            """)
-            
-            metrics_placeholder = st.empty()
-        
-        # Control buttons
+        # Control buttons; callbacks update the state before the page reruns
         col1, col2, col3 = st.columns(3)
         with col1:
-            start_button = st.button("Start Verification", key="start_verification")
+            st.button(
+                "Start Verification",
+                key="start_verification",
+                on_click=_start_verification,
+                args=(pose_estimator, exercise_type)
+            )
         with col2:
-            stop_button = st.button("Stop", key="stop_verification")
+            st.button("Stop", key="stop_verification", on_click=_stop_verification)
         with col3:
-            save_button = st.button("Save Results", key="save_results", disabled=True)
+            st.button(
+                "Save Results",
+                key="save_results",
+                on_click=_save_results,
+                disabled=not st.session_state.get("can_save", False)
+            )
         
         # Store feedback in session state
         if "last_feedback" not in st.session_state:
             st.session_state.last_feedback = {"correct": False, "feedback": "", "metrics": {}}
         
-        # Start verification if button is clicked
-        if start_button:
-            # Set session state to running
-            st.session_state.verification_running = True
-            
-            # Start webcam
-            cap = cv2.VideoCapture(0)
-            
-            if not cap.isOpened():
-                st.error("Failed to access webcam. Please make sure your webcam is connected and accessible.")
-                return
-            
-            # Process frames from webcam
-            while st.session_state.get("verification_running", True):
-                # Read frame from webcam
-                ret, frame = cap.read()
-                
-                if not ret:
-                    st.error("Failed to read from webcam")
-                    break
-                
-                # Process the frame
-                annotated_image, results = pose_estimator.process_image(frame)
-                
-                # Analyze exercise form
-                if results and results.pose_landmarks:
-                    form_analysis = pose_estimator.analyze_exercise_form(results, exercise_type)
-                    
-                    # Update feedback
-                    st.session_state.last_feedback = form_analysis
-                    
-                    # Display feedback
-                    feedback_placeholder.empty()
-                    with feedback_placeholder.container():
-                        st.markdown("### Form Feedback")
-                        display_feedback(form_analysis["feedback"], form_analysis["correct"])
-                    
-                    # Display metrics
-                    metrics_placeholder.empty()
-                    with metrics_placeholder.container():
-                        st.markdown("### Metrics")
-                        metrics = form_analysis.get("metrics", {})
-                        for metric, value in metrics.items():
-                            if isinstance(value, bool):
-                                status = "✅" if value else "❌"
-                                st.markdown(f"**{metric.replace('_', ' ').title()}**: {status}")
-                            elif isinstance(value, (int, float)):
-                                st.markdown(f"**{metric.replace('_', ' ').title()}**: {value:.1f}°")
-                            else:
-                                st.markdown(f"**{metric.replace('_', ' ').title()}**: {value}")
-                
-                # Display the annotated image
-                video_placeholder.image(
-                    annotated_image, 
-                    channels="BGR",
-                    use_column_width=True,
-                    caption=f"Live {exercise_type} Analysis"
-                )
+        if st.session_state.pop("webcam_busy", False):
+            show_warning_box("The webcam is in use by another session. Stop verification there and try again.")
+        
+        if st.session_state.pop("stream_error", False):
+            st.error("Failed to start the live video stream. Please check the logs for details.")
+        
+        if st.session_state.pop("webcam_error", False):
+            st.error("Failed to access webcam. Please make sure your webcam is connected and accessible.")
+        
+        with view:
+            preview_col, feedback_col = st.columns([3, 1])
+            verification = st.session_state.get("verification")
+            if verification is not None:
+                # Apply setting changes made while running
+                verification.pose_estimator = pose_estimator
+                verification.exercise_type = exercise_type
                 
-                # Check if stop button was pressed
-                if stop_button or not st.session_state.get("verification_running", True):
-                    break
+                # The video streams straight from the MJPEG server, so it is
+                # rendered once instead of on every frame
+                with preview_col:
+                    components.html(
+                        f'<img src="{verification.url}" alt="Live {exercise_type} Analysis" '
+                        f'style="width: 100%; height: {VIDEO_HEIGHT}px; object-fit: contain;">',
+                        height=VIDEO_HEIGHT
+                    )
+                    st.caption(f"Live {exercise_type} Analysis")
                 
-                # Short sleep to reduce CPU usage
-                time.sleep(0.03)
-            
-            # Release webcam
-            cap.release()
-            
-            # Enable save button
-            save_button = st.button("Save Results", key="save_results_enabled")
+                # Only rendered while running, so the periodic refresh stops with it
+                with feedback_col:
+                    feedback_panel(verification)
+            else:
+                with feedback_col:
+                    st.markdown("""
+                    ### Form Feedback
+                    Start the verification to get real-time feedback on your exercise form.
+                    """)
+                if st.session_state.get("verification_done", False):
+                    st.info("Verification stopped. You can save your results or start again.")
         
-        # Stop verification if button is clicked
-        if stop_button:
-            st.session_state.verification_running = False
-            st.info("Verification stopped. You can save your results or start again.")
-        
-        # Save results if button is clicked
-        if save_button:
-            # Here you would save the results to a database or file
+        # Confirm saved results once
+        if st.session_state.pop("results_saved", False):
             show_success_box("Results saved successfully! You can view your progress in the Progress Tracking page.")
-            
-            # Disable the save button after saving
-            st.session_state.save_button_clicked = True
         
     except Exception as e:
         logger.error(f"Error in exercise verification page: {e}")
@@ -14,7 +14,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 # Import utility functions
 from src.utils.config_utils import get_app_config
 from src.utils.ui_utils import (
-    set_page_config, apply_custom_css, display_header, 
+    set_page_config, apply_custom_css, display_header, display_navigation,
     show_info_box, show_success_box, show_warning_box,
     display_progress_summary
 )
@@ -24,6 +24,56 @@ from src.utils.progress_tracker import ProgressTracker
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Charts are cached per saved version of the progress data (and per day, since
+# the time window ends today), so reruns reuse the built figures
+CHART_CACHE_ENTRIES = 32
+_TRACKER_HASH_FUNCS = {
+    ProgressTracker: lambda tracker: (tracker.progress_file, tracker.data_mtime, datetime.date.today())
+}
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, hash_funcs=_TRACKER_HASH_FUNCS, show_spinner=False)
+def get_weight_chart(progress_tracker: ProgressTracker, days: int) -> go.Figure:
+    """
+    Get the weight chart, cached per data version and time period
+    
+    Args:
+        progress_tracker: Tracker holding the progress data
+        days: Number of days to include in chart
+        
+    Returns:
+        Plotly Figure object
+    """
+    return progress_tracker.create_weight_chart(days)
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, hash_funcs=_TRACKER_HASH_FUNCS, show_spinner=False)
+def get_body_fat_chart(progress_tracker: ProgressTracker, days: int) -> go.Figure:
+    """
+    Get the body fat chart, cached per data version and time period
+    
+    Args:
+        progress_tracker: Tracker holding the progress data
+        days: Number of days to include in chart
+        
+    Returns:
+        Plotly Figure object
+    """
+    return progress_tracker.create_body_fat_chart(days)
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, hash_funcs=_TRACKER_HASH_FUNCS, show_spinner=False)
+def get_exercise_chart(progress_tracker: ProgressTracker, exercise: str, days: int) -> go.Figure:
+    """
+    Get an exercise chart, cached per data version, exercise and time period
+    
+    Args:
+        progress_tracker: Tracker holding the progress data
+        exercise: Exercise name
+        days: Number of days to include in chart
+        
+    Returns:
+        Plotly Figure object
+    """
+    return progress_tracker.create_exercise_chart(exercise, days)
+
 def main():
     """
     Main function for the progress tracking page
@@ -50,22 +100,7 @@ def main():
         )
         
         # Sidebar navigation
-        st.sidebar.title("Navigation")
-        
-        if st.sidebar.button("🏠 Home"):
-            st.switch_page("app.py")
-            
-        if st.sidebar.button("🏋️ Exercise Verification"):
-            st.switch_page("pages/exercise_verification.py")
-            
-        if st.sidebar.button("📏 Body Analysis"):
-            st.switch_page("pages/body_analysis.py")
-            
-        if st.sidebar.button("📋 Exercise Recommendations"):
-            st.switch_page("pages/exercise_recommendations.py")
-        
-        if st.sidebar.button("🧮 Health Measurements"):
-            st.switch_page("pages/measurements.py")
+        display_navigation("pages/progress_tracking.py")
         
         # Initialize progress tracker
         progress_tracker = ProgressTracker(data_dir="data")
@@ -104,13 +139,12 @@ def main():
             
             # Show most recent entries
             st.markdown("### Recent Entries")
-            recent_data = progress_tracker.progress_data.sort_values("date", ascending=False).head(5)
+            # Select the five latest without sorting the whole log
+            recent_data = progress_tracker.progress_data.nlargest(5, "date")
             
             if len(recent_data) > 0:
                 # Format the data for display
-                display_data = recent_data.copy()
-                display_data["date"] = display_data["date"].dt.strftime("%Y-%m-%d")
-                display_data = display_data.fillna("-")
+                display_data = recent_data.assign(date=recent_data["date"].dt.strftime("%Y-%m-%d")).fillna("-")
                 
                 # Display the data
                 st.dataframe(
@@ -232,18 +266,20 @@ def main():
                         logger.error(f"Error importing data: {e}")
                         show_warning_box("Error importing data. Please check the file format.")
         
+        # Charts have fixed keys, so changing the time period or exercise
+        # updates the existing plot in the browser instead of replacing it
         with tab3:
             st.markdown("## Weight & Body Fat Tracking")
             
             # Weight chart
             st.markdown("### Weight Progress")
-            weight_chart = progress_tracker.create_weight_chart(days)
-            st.plotly_chart(weight_chart, use_container_width=True)
+            weight_chart = get_weight_chart(progress_tracker, days)
+            st.plotly_chart(weight_chart, use_container_width=True, key="weight_chart")
             
             # Body fat chart
             st.markdown("### Body Fat Progress")
-            body_fat_chart = progress_tracker.create_body_fat_chart(days)
-            st.plotly_chart(body_fat_chart, use_container_width=True)
+            body_fat_chart = get_body_fat_chart(progress_tracker, days)
+            st.plotly_chart(body_fat_chart, use_container_width=True, key="body_fat_chart")
         
         with tab4:
             st.markdown("## Exercise Progress")
@@ -262,8 +298,8 @@ def main():
                 
                 # Exercise chart
                 st.markdown(f"### {selected_exercise} Progress")
-                exercise_chart = progress_tracker.create_exercise_chart(selected_exercise, days)
-                st.plotly_chart(exercise_chart, use_container_width=True)
+                exercise_chart = get_exercise_chart(progress_tracker, selected_exercise, days)
+                st.plotly_chart(exercise_chart, use_container_width=True, key="exercise_chart")
                 
                 # Exercise data table
                 st.markdown("### Exercise Details")
@@ -0,0 +1,189 @@
+import streamlit as st
+import atexit
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from src.core.pose_estimation import PoseEstimator
+from src.core.live_verification import LiveVerification, open_webcam, HEARTBEAT_TIMEOUT
+from src.models.model_manager import ModelManager
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Each distinct set of settings holds a loaded MediaPipe graph
+POSE_ESTIMATOR_CACHE_ENTRIES = 4
+
+# Session holding the shared webcam for verification, the verification it
+# runs and when it took the webcam, guarded by the lock
+_webcam_lock = threading.Lock()
+_webcam_owner: Optional[str] = None
+_webcam_verification: Optional[LiveVerification] = None
+_webcam_acquired_at = 0.0
+
+@st.cache_resource(show_spinner=False, max_entries=POSE_ESTIMATOR_CACHE_ENTRIES)
+def get_pose_estimator(static_image_mode: bool = True,
+                       model_complexity: int = 1,
+                       min_detection_confidence: float = 0.5,
+                       min_tracking_confidence: float = 0.5) -> PoseEstimator:
+    """
+    Get a pose estimator shared across reruns and sessions
+    
+    Only use this for static image mode: in video mode MediaPipe tracks the
+    pose between frames, and that state must not be shared between sessions.
+    
+    Args:
+        static_image_mode: Whether to treat input as a static image
+        model_complexity: Model complexity (0, 1, or 2)
+        min_detection_confidence: Minimum confidence for detection
+        min_tracking_confidence: Minimum confidence for tracking
+        
+    Returns:
+        Cached PoseEstimator for these settings
+    """
+    logger.info("Creating shared pose estimator")
+    return PoseEstimator(
+        static_image_mode=static_image_mode,
+        model_complexity=model_complexity,
+        min_detection_confidence=min_detection_confidence,
+        min_tracking_confidence=min_tracking_confidence
+    )
+
+def get_session_pose_estimator(static_image_mode: bool = False,
+                               model_complexity: int = 1,
+                               min_detection_confidence: float = 0.5,
+                               min_tracking_confidence: float = 0.5) -> PoseEstimator:
+    """
+    Get a pose estimator kept across reruns of the current session
+    
+    Video mode estimators track the pose between frames, so each session
+    gets its own; static image mode estimators are shared by all sessions.
+    
+    Args:
+        static_image_mode: Whether to treat input as a static image
+        model_complexity: Model complexity (0, 1, or 2)
+        min_detection_confidence: Minimum confidence for detection
+        min_tracking_confidence: Minimum confidence for tracking
+        
+    Returns:
+        PoseEstimator for these settings, rebuilt only when they change
+    """
+    settings = (static_image_mode, model_complexity, min_detection_confidence, min_tracking_confidence)
+    if static_image_mode:
+        return get_pose_estimator(*settings)
+    
+    cached = st.session_state.get("_pose_estimator")
+    if cached is None or cached[0] != settings:
+        logger.info("Creating pose estimator for this session")
+        cached = (settings, PoseEstimator(*settings))
+        st.session_state["_pose_estimator"] = cached
+    return cached[1]
+
+@st.cache_resource(show_spinner=False)
+def get_webcam(camera_index: int = 0) -> Any:
+    """
+    Get a webcam capture kept open across verification sessions
+    
+    The capture is released when the process exits. Use acquire_webcam
+    rather than calling this directly, so only one session reads from it.
+    
+    Args:
+        camera_index: OpenCV index of the webcam
+        
+    Returns:
+        Cached cv2.VideoCapture, which is not opened if the webcam is unavailable
+    """
+    logger.info(f"Opening webcam {camera_index}")
+    cap = open_webcam(camera_index)
+    atexit.register(cap.release)
+    return cap
+
+def _webcam_abandoned() -> bool:
+    """
+    Check whether the session holding the webcam is gone
+    
+    Must be called with the webcam lock held.
+    
+    Returns:
+        True if its verification thread is dead or its page stopped sending
+        heartbeats, or it never started a verification within the timeout
+    """
+    if _webcam_verification is None:
+        return time.monotonic() - _webcam_acquired_at > HEARTBEAT_TIMEOUT
+    return not _webcam_verification.running or _webcam_verification.stale
+
+def acquire_webcam(owner: str, camera_index: int = 0) -> Optional[Any]:
+    """
+    Take the shared webcam for one verification session
+    
+    The webcam is reopened if it was unavailable or failed last time. A
+    session whose tab was closed while verifying never releases the webcam,
+    so it is taken over once that session is abandoned.
+    
+    Args:
+        owner: Identifier of the session taking the webcam
+        camera_index: OpenCV index of the webcam
+        
+    Returns:
+        Cached cv2.VideoCapture (not opened if the webcam is unavailable), or
+        None if another session is using it
+    """
+    global _webcam_owner, _webcam_verification, _webcam_acquired_at
+    with _webcam_lock:
+        if _webcam_owner not in (None, owner):
+            if not _webcam_abandoned():
+                return None
+            
+            # Stop the abandoned session's thread before reading from the webcam
+            logger.warning("Taking over the webcam from an abandoned session")
+            if _webcam_verification is not None:
+                _webcam_verification.stop()
+        
+        cap = get_webcam(camera_index)
+        if not cap.isOpened():
+            get_webcam.clear()
+            cap = get_webcam(camera_index)
+        
+        _webcam_owner = owner
+        _webcam_verification = None
+        _webcam_acquired_at = time.monotonic()
+        return cap
+
+def track_webcam_verification(owner: str, verification: LiveVerification) -> None:
+    """
+    Record the verification reading the webcam, so acquire_webcam can tell
+    when it is abandoned
+    
+    Args:
+        owner: Identifier passed to acquire_webcam
+        verification: Started verification using the webcam
+    """
+    global _webcam_verification
+    with _webcam_lock:
+        if _webcam_owner == owner:
+            _webcam_verification = verification
+
+def release_webcam(owner: str) -> None:
+    """
+    Hand the shared webcam back, leaving it open for the next session
+    
+    Args:
+        owner: Identifier passed to acquire_webcam
+    """
+    global _webcam_owner, _webcam_verification
+    with _webcam_lock:
+        if _webcam_owner == owner:
+            _webcam_owner = None
+            _webcam_verification = None
+
+@st.cache_resource(show_spinner=False)
+def get_model_manager() -> ModelManager:
+    """
+    Get a model manager shared across reruns and sessions
+    
+    Returns:
+        Cached ModelManager with its models loaded
+    """
+    logger.info("Creating shared model manager")
+    return ModelManager()
@@ -1,38 +1,83 @@
 import yaml
 import os
+import copy
 import logging
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def load_config(config_path: str = "src/config/config.yaml") -> Dict[str, Any]:
+# libyaml's C loader parses several times faster than the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+@lru_cache(maxsize=8)
+def _parse_config(config_path: str, mtime: float) -> Dict[str, Any]:
     """
-    Load configuration from YAML file
+    Parse a YAML configuration file, memoized per process
     
     Args:
         config_path: Path to the configuration file
+        mtime: Modification time of the file, so an edited file is re-read
         
     Returns:
-        Dictionary containing configuration settings
+        Parsed configuration, shared by all callers
+    """
+    with open(config_path, 'r') as file:
+        config = yaml.load(file, Loader=_YamlLoader)
+        logger.info(f"Configuration loaded successfully from {config_path}")
+        return config
+
+# Used when the configuration file cannot be read
+DEFAULT_CONFIG = {
+    "app": {
+        "title": "AI Health Trainer",
+        "icon": "💪",
+        "layout": "wide",
+        "initial_sidebar_state": "expanded"
+    }
+}
+
+def _cached_config(config_path: str = "src/config/config.yaml") -> Dict[str, Any]:
+    """
+    Get the memoized configuration, shared by all callers
+    
+    Args:
+        config_path: Path to the configuration file
+        
+    Returns:
+        Parsed configuration, or the default configuration on error; must not be modified
     """
     try:
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
-            logger.info(f"Configuration loaded successfully from {config_path}")
-            return config
+        return _parse_config(config_path, os.path.getmtime(config_path))
     except Exception as e:
         logger.error(f"Error loading configuration: {e}")
-        # Return default configuration
-        return {
-            "app": {
-                "title": "AI Health Trainer",
-                "icon": "💪",
-                "layout": "wide",
-                "initial_sidebar_state": "expanded"
-            }
-        }
+        return DEFAULT_CONFIG
+
+def clear_config_cache() -> None:
+    """
+    Forget all parsed configuration files, so the next load reads them again
+    """
+    _parse_config.cache_clear()
+
+def load_config(config_path: str = "src/config/config.yaml") -> Dict[str, Any]:
+    """
+    Load configuration from YAML file
+    
+    The file is parsed once per modification time, so page reruns do not
+    re-read it from disk.
+    
+    Args:
+        config_path: Path to the configuration file
+        
+    Returns:
+        Dictionary containing configuration settings
+    """
+    # Hand out a copy so callers cannot change the cached settings
+    return copy.deepcopy(_cached_config(config_path))
 
 def get_app_config() -> Dict[str, Any]:
     """
@@ -41,8 +86,8 @@ def get_app_config() -> Dict[str, Any]:
     Returns:
         Dictionary containing app configuration
     """
-    config = load_config()
-    return config.get("app", {})
+    # Copy only the requested section of the cached settings
+    return copy.deepcopy(_cached_config().get("app", {}))
 
 def get_model_paths() -> Dict[str, str]:
     """
@@ -51,8 +96,8 @@ def get_model_paths() -> Dict[str, str]:
     Returns:
         Dictionary containing model paths
     """
-    config = load_config()
-    return config.get("models", {})
+    # Copy only the requested section of the cached settings
+    return copy.deepcopy(_cached_config().get("models", {}))
 
 def get_exercise_data_paths() -> Dict[str, str]:
     """
@@ -61,8 +106,8 @@ def get_exercise_data_paths() -> Dict[str, str]:
     Returns:
         Dictionary containing data file paths
     """
-    config = load_config()
-    return config.get("exercise_data", {})
+    # Copy only the requested section of the cached settings
+    return copy.deepcopy(_cached_config().get("exercise_data", {}))
 
 def get_mediapipe_config() -> Dict[str, Any]:
     """
@@ -71,8 +116,8 @@ def get_mediapipe_config() -> Dict[str, Any]:
     Returns:
         Dictionary containing MediaPipe configuration
     """
-    config = load_config()
-    return config.get("mediapipe", {}).get("pose", {})
+    # Copy only the requested section of the cached settings
+    return copy.deepcopy(_cached_config().get("mediapipe", {}).get("pose", {}))
 
 def get_ui_theme() -> Dict[str, Any]:
     """
@@ -81,8 +126,8 @@ def get_ui_theme() -> Dict[str, Any]:
     Returns:
         Dictionary containing UI theme settings
     """
-    config = load_config()
-    return config.get("ui", {}).get("theme", {})
+    # Copy only the requested section of the cached settings
+    return copy.deepcopy(_cached_config().get("ui", {}).get("theme", {}))
 
 def get_home_config() -> Dict[str, Any]:
     """
@@ -91,5 +136,5 @@ def get_home_config() -> Dict[str, Any]:
     Returns:
         Dictionary containing home page settings
     """
-    config = load_config()
-    return config.get("home", {}) 
\ No newline at end of file
+    # Copy only the requested section of the cached settings
+    return copy.deepcopy(_cached_config().get("home", {})) 
\ No newline at end of file
@@ -0,0 +1,114 @@
+import logging
+from functools import lru_cache
+from typing import NamedTuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Bounds of the normal BMI range used for the target weights
+NORMAL_BMI_LOW = 18.5
+NORMAL_BMI_HIGH = 24.9
+
+class HealthMetrics(NamedTuple):
+    """
+    Health measurements derived from weight, height, age and gender
+    """
+    bmi: float
+    bmr: float
+    ideal_weight: float
+    bmi_category: str
+    target_weight_low: float
+    target_weight_high: float
+
+def calculate_bmi(weight: float, height: float) -> float:
+    """
+    Calculate the body mass index
+    
+    Args:
+        weight: Weight in kg
+        height: Height in cm
+    
+    Returns:
+        BMI, or 0 for a non-positive height
+    """
+    if height <= 0:
+        return 0
+    return weight / ((height / 100) ** 2)
+
+def calculate_bmr(weight: float, height: float, age: int, gender: str) -> float:
+    """
+    Calculate the basal metabolic rate (revised Harris-Benedict equation)
+    
+    Args:
+        weight: Weight in kg
+        height: Height in cm
+        age: Age in years
+        gender: "Male" or "Female"
+    
+    Returns:
+        BMR in kcal/day
+    """
+    if gender == "Male":
+        return 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
+    else:
+        return 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
+
+def calculate_ideal_weight(height: float, gender: str) -> float:
+    """
+    Calculate the ideal weight (Devine formula)
+    
+    Args:
+        height: Height in cm
+        gender: "Male" or "Female"
+    
+    Returns:
+        Ideal weight in kg
+    """
+    if gender == "Male":
+        return 50 + 0.91 * (height - 152.4)
+    else:
+        return 45.5 + 0.91 * (height - 152.4)
+
+def bmi_category(bmi: float) -> str:
+    """
+    Get the weight category of a BMI
+    
+    Args:
+        bmi: Body mass index
+    
+    Returns:
+        Category name
+    """
+    if bmi < 18.5:
+        return "Underweight"
+    elif bmi < 25:
+        return "Normal weight"
+    elif bmi < 30:
+        return "Overweight"
+    else:
+        return "Obese"
+
+@lru_cache(maxsize=256)
+def compute_health_metrics(weight: float, height: float, age: int, gender: str) -> HealthMetrics:
+    """
+    Compute all health measurements at once, memoized per set of inputs
+    
+    Args:
+        weight: Weight in kg
+        height: Height in cm
+        age: Age in years
+        gender: "Male" or "Female"
+    
+    Returns:
+        HealthMetrics for these inputs
+    """
+    bmi = calculate_bmi(weight, height)
+    height_m2 = (height / 100) ** 2
+    return HealthMetrics(
+        bmi=bmi,
+        bmr=calculate_bmr(weight, height, age, gender),
+        ideal_weight=calculate_ideal_weight(height, gender),
+        bmi_category=bmi_category(bmi),
+        target_weight_low=NORMAL_BMI_LOW * height_m2,
+        target_weight_high=NORMAL_BMI_HIGH * height_m2
+    )
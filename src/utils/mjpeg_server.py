@@ -0,0 +1,172 @@
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Address of the MJPEG server; the webcam is read on the machine running the
+# app, so the browser viewing it is expected to be on the same machine. If
+# MJPEG_PORT is taken (e.g. by another app instance) a free port is used
+MJPEG_HOST = "localhost"
+MJPEG_PORT = 8765
+
+_BOUNDARY = "frame"
+
+class FrameStream:
+    """
+    Latest JPEG frame of a live video, handed to any number of viewers
+    """
+    def __init__(self):
+        """
+        Initialize an empty frame stream
+        """
+        self._frame: Optional[bytes] = None
+        self._frame_id = 0
+        self._closed = False
+        self._condition = threading.Condition()
+    
+    def publish(self, jpeg: bytes) -> None:
+        """
+        Replace the current frame and wake up waiting viewers
+        
+        Args:
+            jpeg: JPEG-encoded frame
+        """
+        with self._condition:
+            self._frame = jpeg
+            self._frame_id += 1
+            self._condition.notify_all()
+    
+    def close(self) -> None:
+        """
+        End the stream for all viewers
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+    
+    def frames(self, timeout: float = 5.0) -> Iterator[bytes]:
+        """
+        Yield each new frame as it is published
+        
+        Frames published while a viewer is still sending the previous one
+        are skipped, so slow viewers never fall behind.
+        
+        Args:
+            timeout: Seconds to wait for a new frame before giving up
+        
+        Returns:
+            Iterator of JPEG frames, ending when the stream is closed
+        """
+        last_id = 0
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(lambda: self._closed or self._frame_id != last_id, timeout):
+                    return
+                if self._closed:
+                    return
+                frame, last_id = self._frame, self._frame_id
+            yield frame
+
+# Streams being served, by stream id
+_streams: Dict[str, FrameStream] = {}
+_streams_lock = threading.Lock()
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+class _MJPEGHandler(BaseHTTPRequestHandler):
+    """
+    Serve /mjpeg/<stream id> as a multipart/x-mixed-replace JPEG stream
+    """
+    def do_GET(self) -> None:
+        prefix = "/mjpeg/"
+        with _streams_lock:
+            stream = _streams.get(self.path[len(prefix):]) if self.path.startswith(prefix) else None
+        
+        if stream is None:
+            self.send_error(404)
+            return
+        
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={_BOUNDARY}")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        
+        try:
+            for frame in stream.frames():
+                self.wfile.write(
+                    f"--{_BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(frame)}\r\n\r\n".encode()
+                )
+                self.wfile.write(frame)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Viewer closed the page
+            pass
+    
+    def log_message(self, format: str, *args) -> None:
+        # Keep per-request logging out of the app log
+        pass
+
+def _ensure_server() -> None:
+    """
+    Start the MJPEG server in a daemon thread if it is not running yet
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            try:
+                server = ThreadingHTTPServer((MJPEG_HOST, MJPEG_PORT), _MJPEGHandler)
+            except OSError:
+                # Let the OS pick a free port
+                server = ThreadingHTTPServer((MJPEG_HOST, 0), _MJPEGHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="mjpeg-server", daemon=True).start()
+            _server = server
+            logger.info(f"MJPEG server listening on {MJPEG_HOST}:{server.server_address[1]}")
+
+def open_stream(stream_id: str) -> FrameStream:
+    """
+    Create a frame stream and serve it at stream_url(stream_id)
+    
+    Args:
+        stream_id: URL-safe identifier of the stream
+    
+    Returns:
+        FrameStream to publish frames to
+    
+    Raises:
+        OSError: If the MJPEG server cannot be started
+    """
+    _ensure_server()
+    stream = FrameStream()
+    with _streams_lock:
+        _streams[stream_id] = stream
+    return stream
+
+def close_stream(stream_id: str) -> None:
+    """
+    Stop serving a frame stream and disconnect its viewers
+    
+    Args:
+        stream_id: Identifier passed to open_stream
+    """
+    with _streams_lock:
+        stream = _streams.pop(stream_id, None)
+    if stream is not None:
+        stream.close()
+
+def stream_url(stream_id: str) -> str:
+    """
+    Get the URL a browser can load a frame stream from
+    
+    Args:
+        stream_id: Identifier passed to open_stream
+    
+    Returns:
+        URL of the MJPEG stream, on the port the server is bound to
+    """
+    port = _server.server_address[1] if _server is not None else MJPEG_PORT
+    return f"http://{MJPEG_HOST}:{port}/mjpeg/{stream_id}"
@@ -9,7 +9,6 @@ import plotly.express as px
 import plotly.graph_objects as go
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class ProgressTracker:
@@ -27,6 +26,35 @@ class ProgressTracker:
         self.progress_file = os.path.join(data_dir, "progress_data.csv")
         self.progress_data = self._load_progress_data()
         
+        # Modification time of the saved data, identifying its version for caches
+        self.data_mtime = self._file_mtime()
+        
+    @staticmethod
+    def _empty_progress_data() -> pd.DataFrame:
+        """
+        Create an empty progress DataFrame
+        
+        The date column is typed as datetime, so it stays datetime once
+        entries are added and date operations work on it.
+        
+        Returns:
+            Empty DataFrame with the progress data columns
+        """
+        data = pd.DataFrame(columns=["date", "weight", "body_fat", "exercise", "sets", "reps", "notes"])
+        return data.astype({"date": "datetime64[ns]"})
+    
+    def _file_mtime(self) -> float:
+        """
+        Get the modification time of the progress data file
+        
+        Returns:
+            Modification time, or 0.0 if the file does not exist
+        """
+        try:
+            return os.path.getmtime(self.progress_file)
+        except OSError:
+            return 0.0
+    
     def _load_progress_data(self) -> pd.DataFrame:
         """
         Load progress data from CSV file
@@ -43,10 +71,10 @@ class ProgressTracker:
                 return data
             else:
                 logger.info("No progress data file found, creating new DataFrame")
-                return pd.DataFrame(columns=["date", "weight", "body_fat", "exercise", "sets", "reps", "notes"])
+                return self._empty_progress_data()
         except Exception as e:
             logger.error(f"Error loading progress data: {e}")
-            return pd.DataFrame(columns=["date", "weight", "body_fat", "exercise", "sets", "reps", "notes"])
+            return self._empty_progress_data()
     
     def add_progress_entry(self, 
                            date: str,
@@ -372,6 +400,7 @@ class ProgressTracker:
             
             # Save to CSV
             self.progress_data.to_csv(self.progress_file, index=False)
+            self.data_mtime = self._file_mtime()
             logger.info(f"Progress data saved to {self.progress_file}")
             
         except Exception as e:
@@ -385,7 +414,7 @@ class ProgressTracker:
             True if data was cleared successfully, False otherwise
         """
         try:
-            self.progress_data = pd.DataFrame(columns=["date", "weight", "body_fat", "exercise", "sets", "reps", "notes"])
+            self.progress_data = self._empty_progress_data()
             self._save_progress_data()
             logger.info("Progress data cleared")
             return True
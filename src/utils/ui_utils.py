@@ -7,9 +7,18 @@ from typing import Dict, List, Tuple, Optional, Any
 import logging
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Pages in the sidebar navigation, as (button label, page path relative to src/)
+NAV_PAGES = (
+    ("🏠 Home", "app.py"),
+    ("🏋️ Exercise Verification", "pages/exercise_verification.py"),
+    ("📏 Body Analysis", "pages/body_analysis.py"),
+    ("📋 Exercise Recommendations", "pages/exercise_recommendations.py"),
+    ("📈 Progress Tracking", "pages/progress_tracking.py"),
+    ("🧮 Health Measurements", "pages/measurements.py")
+)
+
 def set_page_config(title: str = "AI Health Trainer", 
                     icon: str = "💪", 
                     layout: str = "wide",
@@ -405,6 +414,33 @@ def apply_custom_css() -> None:
     except Exception as e:
         logger.error(f"Error applying custom CSS: {e}")
 
+@st.fragment
+def _navigation_buttons(current_page: str) -> None:
+    """
+    Show a button for every page except the current one
+    
+    Args:
+        current_page: Path of the current page, as in NAV_PAGES
+    """
+    st.title("Navigation")
+    for label, page in NAV_PAGES:
+        if page != current_page and st.button(label):
+            st.switch_page(page)
+
+def display_navigation(current_page: str) -> None:
+    """
+    Display the sidebar navigation
+    
+    The buttons run as a fragment, so a click reruns only them before
+    switching pages, not the whole current page.
+    
+    Args:
+        current_page: Path of the current page, as in NAV_PAGES
+    """
+    # Fragments cannot write to the sidebar themselves, so call it inside
+    with st.sidebar:
+        _navigation_buttons(current_page)
+
 def display_header(title: str, subtitle: str = "", icon: str = None) -> None:
     """
     Display page header with title and subtitle